@@ -0,0 +1,38 @@
+"""post trending
+
+Revision ID: 0b6e4d2a9f75
+Revises: f7a3d9e2c618
+Create Date: 2026-10-18 17:05:14.332870
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0b6e4d2a9f75"
+down_revision: Union[str, Sequence[str], None] = "f7a3d9e2c618"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "post_trending",
+        sa.Column("post_id", sa.BigInteger(), nullable=False),
+        sa.Column("score", sa.Float(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["post_id"], ["post.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("post_id"),
+    )
+    op.create_index("ix_post_trending_score", "post_trending", [sa.text("score DESC")])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_post_trending_score", table_name="post_trending")
+    op.drop_table("post_trending")
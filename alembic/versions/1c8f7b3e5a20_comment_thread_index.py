@@ -0,0 +1,56 @@
+"""comment thread index
+
+Revision ID: 1c8f7b3e5a20
+Revises: 0b6e4d2a9f75
+Create Date: 2026-10-18 17:48:03.125694
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "1c8f7b3e5a20"
+down_revision: Union[str, Sequence[str], None] = "0b6e4d2a9f75"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # comments_count was never maintained before; start from the real counts.
+    op.execute(
+        """
+        UPDATE post
+        SET comments_count = counts.n
+        FROM (
+            SELECT post.id, count(comments.id) AS n
+            FROM post
+            LEFT JOIN comments ON comments.post_id = post.id
+            GROUP BY post.id
+        ) AS counts
+        WHERE post.id = counts.id AND post.comments_count IS DISTINCT FROM counts.n
+        """
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_comments_post_id_created_at_id",
+            "comments",
+            ["post_id", "created_at", "id"],
+            postgresql_concurrently=True,
+        )
+        # Covered by the leading column of the new index.
+        op.drop_index(
+            "ix_comments_post_id",
+            table_name="comments",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index("ix_comments_post_id", "comments", ["post_id"])
+    op.drop_index("ix_comments_post_id_created_at_id", table_name="comments")
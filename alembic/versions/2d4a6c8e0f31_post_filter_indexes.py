@@ -0,0 +1,76 @@
+"""post filter indexes
+
+Revision ID: 2d4a6c8e0f31
+Revises: 1c8f7b3e5a20
+Create Date: 2026-10-18 18:21:37.402816
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2d4a6c8e0f31"
+down_revision: Union[str, Sequence[str], None] = "1c8f7b3e5a20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_post_user_id_created_at_id",
+            "post",
+            ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_post_category_id_created_at_id",
+            "post",
+            ["category_id", sa.text("created_at DESC"), sa.text("id DESC")],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_post_likes_count_id",
+            "post",
+            [sa.text("likes_count DESC"), sa.text("id DESC")],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_post_views_count_id",
+            "post",
+            [sa.text("views_count DESC"), sa.text("id DESC")],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_post_comments_count_id",
+            "post",
+            [sa.text("comments_count DESC"), sa.text("id DESC")],
+            postgresql_concurrently=True,
+        )
+        # Covered by the leading columns of the new indexes.
+        op.drop_index(
+            op.f("ix_post_user_id"),
+            table_name="post",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            op.f("ix_post_category_id"),
+            table_name="post",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f("ix_post_category_id"), "post", ["category_id"])
+    op.create_index(op.f("ix_post_user_id"), "post", ["user_id"])
+    op.drop_index("ix_post_comments_count_id", table_name="post")
+    op.drop_index("ix_post_views_count_id", table_name="post")
+    op.drop_index("ix_post_likes_count_id", table_name="post")
+    op.drop_index("ix_post_category_id_created_at_id", table_name="post")
+    op.drop_index("ix_post_user_id_created_at_id", table_name="post")
@@ -0,0 +1,37 @@
+"""post feed index
+
+Revision ID: 3b7d1e9a4c52
+Revises: 9aec7efc27c9
+Create Date: 2026-10-18 10:12:41.503817
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3b7d1e9a4c52"
+down_revision: Union[str, Sequence[str], None] = "9aec7efc27c9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY keeps the table writable while the index builds, but it
+    # cannot run inside the migration transaction.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_post_created_at_id",
+            "post",
+            [sa.text("created_at DESC"), sa.text("id DESC")],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_post_created_at_id", table_name="post")
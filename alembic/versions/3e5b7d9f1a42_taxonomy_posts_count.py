@@ -0,0 +1,76 @@
+"""taxonomy posts count
+
+Revision ID: 3e5b7d9f1a42
+Revises: 2d4a6c8e0f31
+Create Date: 2026-10-18 18:54:12.660381
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3e5b7d9f1a42"
+down_revision: Union[str, Sequence[str], None] = "2d4a6c8e0f31"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "categories",
+        sa.Column("posts_count", sa.BigInteger(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "tags",
+        sa.Column("posts_count", sa.BigInteger(), server_default="0", nullable=False),
+    )
+
+    # None of these counts were maintained before; start from the real ones.
+    op.execute(
+        """
+        UPDATE categories
+        SET posts_count = counts.n
+        FROM (
+            SELECT category_id, count(*) AS n
+            FROM post
+            GROUP BY category_id
+        ) AS counts
+        WHERE categories.id = counts.category_id
+        """
+    )
+    op.execute(
+        """
+        UPDATE tags
+        SET posts_count = counts.n
+        FROM (
+            SELECT tag_id, count(*) AS n
+            FROM post_tags
+            GROUP BY tag_id
+        ) AS counts
+        WHERE tags.id = counts.tag_id
+        """
+    )
+    op.execute(
+        """
+        UPDATE users
+        SET posts_count = counts.n
+        FROM (
+            SELECT users.id, count(post.id) AS n
+            FROM users
+            LEFT JOIN post ON post.user_id = users.id
+            GROUP BY users.id
+        ) AS counts
+        WHERE users.id = counts.id AND users.posts_count IS DISTINCT FROM counts.n
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("tags", "posts_count")
+    op.drop_column("categories", "posts_count")
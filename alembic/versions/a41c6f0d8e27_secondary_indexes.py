@@ -0,0 +1,88 @@
+"""secondary indexes
+
+Revision ID: a41c6f0d8e27
+Revises: 3b7d1e9a4c52
+Create Date: 2026-10-18 11:03:09.218450
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a41c6f0d8e27"
+down_revision: Union[str, Sequence[str], None] = "3b7d1e9a4c52"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY keeps the tables writable while the indexes build, but it
+    # cannot run inside the migration transaction.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f("ix_post_user_id"),
+            "post",
+            ["user_id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            op.f("ix_post_category_id"),
+            "post",
+            ["category_id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_post_active_created_at_id",
+            "post",
+            [sa.text("created_at DESC"), sa.text("id DESC")],
+            postgresql_where=sa.text("is_active"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            op.f("ix_post_tags_tag_id"),
+            "post_tags",
+            ["tag_id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            op.f("ix_comments_post_id"),
+            "comments",
+            ["post_id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            op.f("ix_likes_post_id"),
+            "likes",
+            ["post_id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_users_created_at",
+            "users",
+            ["created_at"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_users_active_id",
+            "users",
+            [sa.text("id DESC")],
+            postgresql_where=sa.text("is_active"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_users_active_id", table_name="users")
+    op.drop_index("ix_users_created_at", table_name="users")
+    op.drop_index(op.f("ix_likes_post_id"), table_name="likes")
+    op.drop_index(op.f("ix_comments_post_id"), table_name="comments")
+    op.drop_index(op.f("ix_post_tags_tag_id"), table_name="post_tags")
+    op.drop_index("ix_post_active_created_at_id", table_name="post")
+    op.drop_index(op.f("ix_post_category_id"), table_name="post")
+    op.drop_index(op.f("ix_post_user_id"), table_name="post")
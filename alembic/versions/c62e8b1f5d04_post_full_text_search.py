@@ -0,0 +1,74 @@
+"""post full text search
+
+Revision ID: c62e8b1f5d04
+Revises: a41c6f0d8e27
+Create Date: 2026-10-18 12:20:57.640331
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c62e8b1f5d04"
+down_revision: Union[str, Sequence[str], None] = "a41c6f0d8e27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "post",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(body, ''))",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+
+    # Fold duplicate terms into one row so counts can be upserted by term.
+    op.execute(
+        """
+        UPDATE user_searches AS us
+        SET count = agg.total
+        FROM (
+            SELECT min(id) AS id, sum(count) AS total
+            FROM user_searches
+            GROUP BY term
+        ) AS agg
+        WHERE us.id = agg.id
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM user_searches AS us
+        USING user_searches AS keep
+        WHERE us.term = keep.term AND us.id > keep.id
+        """
+    )
+    op.create_unique_constraint("user_searches_term_key", "user_searches", ["term"])
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_post_search_vector",
+            "post",
+            ["search_vector"],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_post_search_vector", table_name="post")
+    op.drop_constraint("user_searches_term_key", "user_searches", type_="unique")
+    op.drop_column("post", "search_vector")
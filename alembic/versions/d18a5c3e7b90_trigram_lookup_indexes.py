@@ -0,0 +1,48 @@
+"""trigram lookup indexes
+
+Revision ID: d18a5c3e7b90
+Revises: c62e8b1f5d04
+Create Date: 2026-10-18 13:41:26.075912
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d18a5c3e7b90"
+down_revision: Union[str, Sequence[str], None] = "c62e8b1f5d04"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TRGM_INDEXES = [
+    ("ix_post_slug_trgm", "post", "slug"),
+    ("ix_tags_slug_trgm", "tags", "slug"),
+    ("ix_categories_slug_trgm", "categories", "slug"),
+    ("ix_users_first_name_trgm", "users", "first_name"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    with op.get_context().autocommit_block():
+        for name, table, column in TRGM_INDEXES:
+            op.create_index(
+                name,
+                table,
+                [column],
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in reversed(TRGM_INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,47 @@
+"""taxonomy updated_at
+
+Revision ID: e5f29a7c0b13
+Revises: d18a5c3e7b90
+Create Date: 2026-10-18 15:07:52.914306
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e5f29a7c0b13"
+down_revision: Union[str, Sequence[str], None] = "d18a5c3e7b90"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "categories",
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    op.add_column(
+        "tags",
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("tags", "updated_at")
+    op.drop_column("categories", "updated_at")
@@ -0,0 +1,52 @@
+"""unique device likes
+
+Revision ID: f7a3d9e2c618
+Revises: e5f29a7c0b13
+Create Date: 2026-10-18 16:22:38.471059
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f7a3d9e2c618"
+down_revision: Union[str, Sequence[str], None] = "e5f29a7c0b13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        """
+        DELETE FROM likes AS l
+        USING likes AS keep
+        WHERE l.device_id = keep.device_id
+          AND l.post_id = keep.post_id
+          AND l.id > keep.id
+        """
+    )
+    op.create_unique_constraint(
+        "uq_likes_device_id_post_id", "likes", ["device_id", "post_id"]
+    )
+    op.execute(
+        """
+        UPDATE post
+        SET likes_count = counts.n
+        FROM (
+            SELECT post.id, count(likes.id) AS n
+            FROM post
+            LEFT JOIN likes ON likes.post_id = post.id
+            GROUP BY post.id
+        ) AS counts
+        WHERE post.id = counts.id AND post.likes_count IS DISTINCT FROM counts.n
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint("uq_likes_device_id_post_id", "likes", type_="unique")
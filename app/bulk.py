@@ -0,0 +1,215 @@
+import argparse
+import asyncio
+import json
+import os
+
+from dotenv import load_dotenv
+from pydantic import ValidationError
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import DBAPIError
+
+from app.cache import posts_cache
+from app.database import AsyncSessionLocal
+from app.models import Category, Post, PostTag, Tag, User
+from app.post_counts import change_post_counts, clear_taxonomy_caches
+from app.schemas import PostImportRequest
+from app.trending import touch_trending
+from app.utils import generate_slug
+
+load_dotenv()
+
+BULK_BATCH_SIZE = int(os.getenv("BULK_BATCH_SIZE", 1000))
+TITLE_MAX_LENGTH = Post.title.type.length
+SLUG_MAX_LENGTH = Post.slug.type.length
+
+
+async def resolve(session, key_column, id_column, keys) -> dict:
+    if not keys:
+        return {}
+
+    stmt = select(key_column, id_column).where(key_column.in_(set(keys)))
+    res = await session.execute(stmt)
+    return dict(res.all())
+
+
+async def import_batch(session, batch: list[tuple[int, PostImportRequest]]):
+    users = await resolve(session, User.id, User.id, [r.user_id for _, r in batch])
+    category_ids = await resolve(
+        session,
+        Category.id,
+        Category.id,
+        [r.category_id for _, r in batch if r.category_id],
+    )
+    category_slugs = await resolve(
+        session,
+        Category.slug,
+        Category.id,
+        [r.category_slug for _, r in batch if r.category_slug],
+    )
+    tags = await resolve(
+        session, Tag.slug, Tag.id, [slug for _, r in batch for slug in r.tags]
+    )
+
+    errors = []
+    rows = {}
+    for line, data in batch:
+        slug = generate_slug(data.title)
+        missing_tags = [tag for tag in data.tags if tag not in tags]
+
+        if len(data.title) > TITLE_MAX_LENGTH:
+            error = f"Title longer than {TITLE_MAX_LENGTH} characters"
+        elif len(slug) > SLUG_MAX_LENGTH:
+            error = f"Slug longer than {SLUG_MAX_LENGTH} characters"
+        elif data.user_id not in users:
+            error = f"Unknown user {data.user_id}"
+        elif data.category_id and data.category_id not in category_ids:
+            error = f"Unknown category {data.category_id}"
+        elif data.category_slug and data.category_slug not in category_slugs:
+            error = f"Unknown category {data.category_slug}"
+        elif missing_tags:
+            error = f"Unknown tags {missing_tags}"
+        elif slug in rows:
+            error = f"Duplicate slug {slug} in batch"
+        else:
+            rows[slug] = (line, data)
+            continue
+
+        errors.append({"line": line, "error": error})
+
+    if not rows:
+        return 0, errors
+
+    stmt = (
+        insert(Post)
+        .values(
+            [
+                {
+                    "user_id": data.user_id,
+                    "title": data.title,
+                    "slug": slug,
+                    "body": data.body,
+                    "category_id": category_slugs.get(data.category_slug)
+                    or data.category_id,
+                    "created_at": data.created_at or func.now(),
+                }
+                for slug, (_, data) in rows.items()
+            ]
+        )
+        .on_conflict_do_nothing(index_elements=[Post.slug])
+        .returning(Post.slug, Post.id)
+    )
+    res = await session.execute(stmt)
+    inserted = dict(res.all())
+
+    post_tags = []
+    for slug, (line, data) in rows.items():
+        if slug not in inserted:
+            errors.append({"line": line, "error": f"Slug {slug} already exists"})
+            continue
+
+        post_tags.extend(
+            {"post_id": inserted[slug], "tag_id": tags[tag]} for tag in set(data.tags)
+        )
+
+    if post_tags:
+        await session.execute(insert(PostTag).values(post_tags))
+
+    await change_post_counts(
+        session,
+        [
+            (
+                data.user_id,
+                category_slugs.get(data.category_slug) or data.category_id,
+                {tags[tag] for tag in data.tags},
+            )
+            for slug, (_, data) in rows.items()
+            if slug in inserted
+        ],
+        1,
+    )
+    await session.commit()
+    touch_trending(inserted.values())
+    return len(inserted), errors
+
+
+async def import_posts(lines, batch_size: int = BULK_BATCH_SIZE) -> dict:
+    """Import NDJSON posts from an async iterable of lines.
+
+    Each batch is written with multi-row INSERTs and committed on its own, so
+    a bad row, or a batch the database rejects, is reported without stopping
+    the rest of the load.
+    """
+    imported = 0
+    errors = []
+    batch = []
+
+    async def flush():
+        nonlocal imported
+        async with AsyncSessionLocal() as session:
+            try:
+                count, batch_errors = await import_batch(session, batch)
+                imported += count
+                errors.extend(batch_errors)
+            except DBAPIError as exc:
+                await session.rollback()
+                errors.extend(
+                    {"line": line, "error": str(exc.orig)} for line, _ in batch
+                )
+        batch.clear()
+
+    line_no = 0
+    async for line in lines:
+        line_no += 1
+        if not line.strip():
+            continue
+
+        try:
+            batch.append((line_no, PostImportRequest.model_validate_json(line)))
+        except ValidationError as exc:
+            errors.append({"line": line_no, "error": str(exc)})
+
+        if len(batch) >= batch_size:
+            await flush()
+
+    if batch:
+        await flush()
+
+    if imported:
+        await posts_cache.invalidate()
+        clear_taxonomy_caches()
+
+    errors.sort(key=lambda error: error["line"])
+    return {"imported": imported, "failed": len(errors), "errors": errors}
+
+
+async def iter_lines(chunks):
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line
+
+    if buffer:
+        yield buffer
+
+
+async def iter_file(path: str):
+    with open(path, "rb") as f:
+        for line in f:
+            yield line
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import posts from NDJSON.")
+    parser.add_argument("path", help="NDJSON file, one PostImportRequest per line")
+    parser.add_argument("--batch-size", type=int, default=BULK_BATCH_SIZE)
+    args = parser.parse_args()
+
+    report = asyncio.run(import_posts(iter_file(args.path), args.batch_size))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict
+from urllib.parse import urlencode
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+CACHE_TTL = int(os.getenv("CACHE_TTL", 300))
+CACHE_MISSING_TTL = int(os.getenv("CACHE_MISSING_TTL", 30))
+CACHE_MAXSIZE = int(os.getenv("CACHE_MAXSIZE", 1024))
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+# Stored in place of a response the loader found nothing for.
+MISSING = {"__missing__": True}
+
+
+class TTLCache:
+    """Bounded in-process LRU cache whose entries expire after ``ttl`` seconds."""
+
+    def __init__(self, name: str, maxsize: int = CACHE_MAXSIZE, ttl: int = CACHE_TTL):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def get(self, key):
+        entry = self._data.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            self._data.pop(key, None)
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key, value, ttl: int | None = None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def stats(self):
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+class MemoryBackend:
+    """Per-process backend, for a single worker or as a fallback without Redis."""
+
+    name = "memory"
+
+    def __init__(self, maxsize: int = CACHE_MAXSIZE):
+        self._cache = TTLCache("memory", maxsize=maxsize)
+        self._counters: dict[str, int] = {}
+
+    async def get(self, key):
+        return self._cache.get(key)
+
+    async def set(self, key, value, ttl: int):
+        self._cache.set(key, value, ttl)
+
+    async def add(self, key, value, ttl: int) -> bool:
+        if self._cache.get(key) is not None:
+            return False
+
+        self._cache.set(key, value, ttl)
+        return True
+
+    async def delete(self, key):
+        self._cache.invalidate(key)
+
+    async def get_counter(self, key) -> int:
+        return self._counters.get(key, 0)
+
+    async def incr(self, key) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+
+class RedisBackend:
+    """Backend shared by all workers, for any client speaking the Redis protocol.
+
+    ``client`` is a ``redis.asyncio.Redis`` or a compatible stand-in such as
+    ``fakeredis.aioredis.FakeRedis``.
+    """
+
+    name = "redis"
+
+    def __init__(self, client):
+        self.client = client
+
+    @classmethod
+    def from_url(cls, url: str = REDIS_URL):
+        from redis.asyncio import Redis
+
+        return cls(Redis.from_url(url))
+
+    async def get(self, key):
+        value = await self.client.get(key)
+        return None if value is None else json.loads(value)
+
+    async def set(self, key, value, ttl: int):
+        await self.client.set(key, json.dumps(value), ex=ttl)
+
+    async def add(self, key, value, ttl: int) -> bool:
+        return bool(await self.client.set(key, json.dumps(value), ex=ttl, nx=True))
+
+    async def delete(self, key):
+        await self.client.delete(key)
+
+    async def get_counter(self, key) -> int:
+        return int(await self.client.get(key) or 0)
+
+    async def incr(self, key) -> int:
+        return await self.client.incr(key)
+
+
+class ResponseCache:
+    """Read-through cache for endpoint responses, invalidated as a whole.
+
+    Keys embed a version counter kept in the backend, so ``invalidate`` is a
+    single ``INCR`` that every worker sees, and stale entries age out by TTL.
+    A miss is loaded once: concurrent misses in this process await the same
+    load, and other workers wait on a short-lived lock key for its result.
+    Empty results are cached too, for ``missing_ttl`` seconds.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        backend,
+        ttl: int = CACHE_TTL,
+        missing_ttl: int = CACHE_MISSING_TTL,
+        lock_timeout: float = 5.0,
+    ):
+        self.namespace = namespace
+        self.backend = backend
+        self.ttl = ttl
+        self.missing_ttl = missing_ttl
+        self.lock_timeout = lock_timeout
+        self.hits = 0
+        self.misses = 0
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    async def make_key(self, name: str, params: dict) -> str:
+        version = await self.backend.get_counter(f"{self.namespace}:version")
+        query = urlencode(sorted((k, v) for k, v in params.items() if v is not None))
+        return f"{self.namespace}:{version}:{name}?{query}"
+
+    async def get_or_load(self, name: str, params: dict, loader):
+        key = await self.make_key(name, params)
+
+        value = await self.backend.get(key)
+        if value is not None:
+            self.hits += 1
+            return None if value == MISSING else value
+
+        self.misses += 1
+        if key in self._inflight:
+            return await asyncio.shield(self._inflight[key])
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await self._load(key, loader)
+            future.set_result(value)
+            return value
+        except Exception as exc:
+            future.set_exception(exc)
+            # Mark it retrieved in case no other request is waiting on it.
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+            if not future.done():
+                future.cancel()
+
+    async def _load(self, key: str, loader):
+        lock_key = f"{key}:lock"
+        lock_ttl = int(self.lock_timeout) + 1
+        locked = await self.backend.add(lock_key, 1, lock_ttl)
+        try:
+            deadline = time.monotonic() + self.lock_timeout
+            while not locked and time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+                value = await self.backend.get(key)
+                if value is not None:
+                    return None if value == MISSING else value
+                # The lock is gone without a value, so its holder failed: take
+                # it over instead of waiting out the timeout.
+                locked = await self.backend.add(lock_key, 1, lock_ttl)
+
+            value = await loader()
+            if value is None:
+                await self.backend.set(key, MISSING, self.missing_ttl)
+            else:
+                await self.backend.set(key, value, self.ttl)
+            return value
+        finally:
+            if locked:
+                await self.backend.delete(lock_key)
+
+    async def invalidate(self):
+        await self.backend.incr(f"{self.namespace}:version")
+
+    def stats(self):
+        return {
+            "backend": self.backend.name,
+            "ttl": self.ttl,
+            "missing_ttl": self.missing_ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "inflight": len(self._inflight),
+        }
+
+
+def create_backend():
+    if CACHE_BACKEND == "redis":
+        return RedisBackend.from_url()
+
+    return MemoryBackend()
+
+
+categories_cache = TTLCache("categories")
+tags_cache = TTLCache("tags")
+posts_cache = ResponseCache("posts", create_backend())
+
+caches = {
+    "categories": categories_cache,
+    "tags": tags_cache,
+    "posts": posts_cache,
+}
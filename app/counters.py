@@ -0,0 +1,213 @@
+import asyncio
+import logging
+import os
+from collections import Counter
+
+from dotenv import load_dotenv
+from sqlalchemy import BigInteger, column, func, select, update, values
+from sqlalchemy.dialects.postgresql import insert
+
+from app.cache import posts_cache
+from app.database import AsyncSessionLocal
+from app.models import Like, Post, UserSearch
+from app.trending import touch_trending
+
+load_dotenv()
+
+COUNTERS_FLUSH_INTERVAL = float(os.getenv("COUNTERS_FLUSH_INTERVAL", 5))
+COUNTERS_FLUSH_THRESHOLD = int(os.getenv("COUNTERS_FLUSH_THRESHOLD", 1000))
+LIKES_RECONCILE_INTERVAL = float(os.getenv("LIKES_RECONCILE_INTERVAL", 3600))
+
+logger = logging.getLogger(__name__)
+
+
+class CounterBuffer:
+    """Coalesces changes to a ``Post`` counter column in memory and writes
+    them in one batched UPDATE. Subclasses write other counters by overriding
+    ``statement``.
+
+    Pending deltas are flushed every ``flush_interval`` seconds, as soon as
+    ``flush_threshold`` events have been recorded, and once more on shutdown.
+    """
+
+    def __init__(
+        self,
+        column,
+        flush_interval: float = COUNTERS_FLUSH_INTERVAL,
+        flush_threshold: int = COUNTERS_FLUSH_THRESHOLD,
+        session_factory=AsyncSessionLocal,
+    ):
+        self.column = column
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self.session_factory = session_factory
+        self._pending = Counter()
+        self._events = 0
+        self._lock = asyncio.Lock()
+        self._loop_task = None
+        self._flush_task = None
+
+    def record(self, key, delta: int = 1):
+        self._pending[key] += delta
+        self._events += 1
+
+        if self._events >= self.flush_threshold and (
+            self._flush_task is None or self._flush_task.done()
+        ):
+            self._flush_task = asyncio.create_task(self.flush())
+
+    async def flush(self):
+        async with self._lock:
+            pending, self._pending = self._pending, Counter()
+            events, self._events = self._events, 0
+
+            # Sorted keys make concurrent flushes from other workers lock rows
+            # in the same order.
+            deltas = sorted((key, n) for key, n in pending.items() if n)
+            if not deltas:
+                return
+
+            stmt = self.statement(deltas)
+            try:
+                async with self.session_factory() as session:
+                    await session.execute(stmt)
+                    await session.commit()
+            except Exception:
+                logger.exception("Failed to flush %s", self.column)
+                self._pending.update(pending)
+                self._events += events
+                return
+
+            self.flushed([key for key, _ in deltas])
+
+    def statement(self, deltas: list[tuple[int, int]]):
+        batch = values(
+            column("id", BigInteger), column("n", BigInteger), name="v"
+        ).data(deltas)
+        return (
+            update(Post.__table__)
+            .values(
+                {
+                    self.column.key: self.column + batch.c.n,
+                    # Keep updated_at: counters must not change the ETag.
+                    Post.updated_at.key: Post.updated_at,
+                }
+            )
+            .where(Post.id == batch.c.id)
+        )
+
+    def flushed(self, post_ids: list[int]):
+        # Counters feed the trending score.
+        touch_trending(post_ids)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def start(self):
+        self._loop_task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._loop_task:
+            self._loop_task.cancel()
+            try:
+                await self._loop_task
+            except asyncio.CancelledError:
+                pass
+
+        await self.flush()
+
+    def stats(self):
+        return {"pending_keys": len(self._pending), "pending_events": self._events}
+
+
+class SearchTermCounter(CounterBuffer):
+    """Counts searched terms into ``user_searches``, one upsert per flush."""
+
+    def __init__(self, **kwargs):
+        super().__init__(UserSearch.count, **kwargs)
+
+    def statement(self, deltas: list[tuple[str, int]]):
+        stmt = insert(UserSearch).values(
+            [{"term": term, "count": n} for term, n in deltas]
+        )
+        return stmt.on_conflict_do_update(
+            index_elements=[UserSearch.term],
+            set_={"count": UserSearch.count + stmt.excluded.count},
+        )
+
+    def flushed(self, terms: list[str]):
+        pass
+
+
+view_counter = CounterBuffer(Post.views_count)
+like_counter = CounterBuffer(Post.likes_count)
+search_counter = SearchTermCounter()
+
+counters = [view_counter, like_counter, search_counter]
+
+
+async def reconcile_likes_count(session) -> int:
+    """Rewrites every ``likes_count`` that drifted from the ``likes`` table,
+    e.g. after a worker died with deltas still buffered. Returns how many
+    posts were fixed.
+    """
+    count = select(func.count()).where(Like.post_id == Post.id).scalar_subquery()
+    stmt = (
+        update(Post)
+        .values(likes_count=count, updated_at=Post.updated_at)
+        .where(Post.likes_count.is_distinct_from(count))
+    )
+    res = await session.execute(stmt)
+    await session.commit()
+    return res.rowcount
+
+
+class LikeCountReconciler:
+    """Periodically recounts ``likes_count`` from ``likes``.
+
+    This worker's buffered deltas are flushed first. Deltas still buffered in
+    other workers land on top of the recount and are corrected by the next run.
+    """
+
+    def __init__(
+        self,
+        interval: float = LIKES_RECONCILE_INTERVAL,
+        session_factory=AsyncSessionLocal,
+    ):
+        self.interval = interval
+        self.session_factory = session_factory
+        self._task = None
+
+    async def reconcile(self):
+        await like_counter.flush()
+        try:
+            async with self.session_factory() as session:
+                fixed = await reconcile_likes_count(session)
+        except Exception:
+            logger.exception("Failed to reconcile likes counts")
+            return
+
+        if fixed:
+            logger.warning("Reconciled likes_count of %d posts", fixed)
+            await posts_cache.invalidate()
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.reconcile()
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+
+like_count_reconciler = LikeCountReconciler()
@@ -1,11 +1,17 @@
 import os
+import time
 from typing import Annotated
 
 from fastapi import Depends
 
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.metrics import Histogram, instrument_engine
 
 load_dotenv()
 
@@ -15,10 +21,82 @@ DB_HOST = os.getenv("DB_HOST")
 DB_PORT = os.getenv("DB_PORT")
 DB_NAME = os.getenv("DB_NAME")
 DB_URL = f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+ASYNC_DB_URL = (
+    f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+)
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "1").lower() in ("1", "true", "yes")
+
+pool_options = {
+    "pool_size": DB_POOL_SIZE,
+    "max_overflow": DB_MAX_OVERFLOW,
+    "pool_timeout": DB_POOL_TIMEOUT,
+    "pool_recycle": DB_POOL_RECYCLE,
+    "pool_pre_ping": DB_POOL_PRE_PING,
+}
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Times how long each checkout waits for a free connection."""
+
+    wait_time = Histogram()
+    timeouts = 0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            InstrumentedPool.timeouts += 1
+            raise
+        finally:
+            self.wait_time.observe(time.perf_counter() - started)
+
+
+engine = create_engine(DB_URL, **pool_options)
+async_engine = create_async_engine(
+    ASYNC_DB_URL, poolclass=InstrumentedPool, **pool_options
+)
+
+instrument_engine(async_engine.sync_engine)
+
+hold_time = Histogram()
+
+
+@event.listens_for(async_engine.sync_engine, "checkout")
+def on_checkout(dbapi_connection, connection_record, connection_proxy):
+    connection_record.info["checked_out_at"] = time.perf_counter()
+
+
+@event.listens_for(async_engine.sync_engine, "checkin")
+def on_checkin(dbapi_connection, connection_record):
+    checked_out_at = connection_record.info.pop("checked_out_at", None)
+    if checked_out_at is not None:
+        hold_time.observe(time.perf_counter() - checked_out_at)
+
+
+def pool_stats():
+    pool = async_engine.pool
+    return {
+        "size": pool.size(),
+        "max_overflow": DB_MAX_OVERFLOW,
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "timeouts": InstrumentedPool.timeouts,
+        "wait_time": InstrumentedPool.wait_time.stats(),
+        "hold_time": hold_time.stats(),
+    }
 
-engine = create_engine(DB_URL)
 
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
 
 
 class Base(DeclarativeBase):
@@ -33,4 +111,10 @@ def get_db():
         session.close()
 
 
+async def get_async_db():
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
 db_dep = Annotated[Session, Depends(get_db)]
+async_db_dep = Annotated[AsyncSession, Depends(get_async_db)]
@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
 from app.routers import (
@@ -6,16 +8,54 @@ from app.routers import (
     tag_router,
     user_router,
     comment_router,
+    cache_router,
+    like_router,
+    export_router,
+    metrics_router,
+    debug_router,
 )
+from app.counters import counters, like_count_reconciler
+from app.database import async_engine
+from app.metrics import MetricsMiddleware
+from app.post_counts import post_count_reconciler
+from app.profiler import SQL_PROFILER, SQLProfilerMiddleware, install
+from app.trending import trending_refresher
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    for counter in counters:
+        await counter.start()
+    await trending_refresher.start()
+    await post_count_reconciler.start()
+    await like_count_reconciler.start()
+    yield
+    await like_count_reconciler.stop()
+    await post_count_reconciler.stop()
+    await trending_refresher.stop()
+    for counter in counters:
+        await counter.stop()
 
 
 app = FastAPI(
     title="Chesnokday achchiq yangiliklar",
     description="Chesnokuz - news website inspired from Qalampir.uz, built in FastAPI",
+    lifespan=lifespan,
 )
 
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(posts_router)
 app.include_router(category_router)
 app.include_router(tag_router)
 app.include_router(user_router)
 app.include_router(comment_router)
+app.include_router(like_router)
+app.include_router(export_router)
+app.include_router(cache_router)
+app.include_router(metrics_router)
+
+if SQL_PROFILER:
+    install(async_engine.sync_engine)
+    app.add_middleware(SQLProfilerMiddleware, engine=async_engine)
+    app.include_router(debug_router)
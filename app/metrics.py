@@ -0,0 +1,221 @@
+import bisect
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+# Seconds, from a warm pooled connection up to a request stuck on pool_timeout.
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    """Counts observations into fixed upper-bounded buckets, Prometheus style."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        total = 0
+        result = []
+        for bound, n in zip((*map(str, self.buckets), "+Inf"), self.counts):
+            total += n
+            result.append((bound, total))
+        return result
+
+    def stats(self):
+        return {
+            "buckets": dict(self.cumulative()),
+            "sum": self.sum,
+            "count": self.count,
+        }
+
+
+def format_labels(names, values) -> str:
+    if not names:
+        return ""
+
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"')
+        value = value.replace("\n", "\\n")
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class Metric:
+    """A metric family: one value, or one histogram, per combination of labels."""
+
+    def __init__(self, name: str, help: str, kind: str, labels=(), buckets=None):
+        self.name = name
+        self.help = help
+        self.kind = kind
+        self.labels = tuple(labels)
+        self.buckets = buckets
+        self.values = {}
+
+    def inc(self, labels=(), amount: float = 1):
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def dec(self, labels=(), amount: float = 1):
+        self.inc(labels, -amount)
+
+    def set(self, labels=(), value: float = 0):
+        self.values[labels] = value
+
+    def observe(self, labels=(), value: float = 0):
+        histogram = self.values.get(labels)
+        if histogram is None:
+            histogram = self.values[labels] = Histogram(self.buckets or LATENCY_BUCKETS)
+        histogram.observe(value)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for values, value in sorted(self.values.items()):
+            if self.kind != "histogram":
+                lines.append(f"{self.name}{format_labels(self.labels, values)} {value}")
+                continue
+
+            names = (*self.labels, "le")
+            for bound, total in value.cumulative():
+                labels = format_labels(names, (*values, bound))
+                lines.append(f"{self.name}_bucket{labels} {total}")
+            labels = format_labels(self.labels, values)
+            lines.append(f"{self.name}_sum{labels} {value.sum}")
+            lines.append(f"{self.name}_count{labels} {value.count}")
+        return lines
+
+
+http_requests_total = Metric(
+    "http_requests_total",
+    "HTTP requests by route template and status.",
+    "counter",
+    ("method", "route", "status"),
+)
+http_request_duration_seconds = Metric(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    "histogram",
+    ("method", "route"),
+)
+http_requests_in_progress = Metric(
+    "http_requests_in_progress",
+    "HTTP requests being served.",
+    "gauge",
+    ("method",),
+)
+http_response_size_bytes = Metric(
+    "http_response_size_bytes",
+    "HTTP response body size by route template.",
+    "histogram",
+    ("method", "route"),
+    SIZE_BUCKETS,
+)
+http_request_db_queries = Metric(
+    "http_request_db_queries",
+    "Database queries run per HTTP request, by route template.",
+    "histogram",
+    ("method", "route"),
+    QUERY_COUNT_BUCKETS,
+)
+http_request_db_seconds = Metric(
+    "http_request_db_seconds",
+    "Time spent in database queries per HTTP request, by route template.",
+    "histogram",
+    ("method", "route"),
+)
+
+http_metrics = [
+    http_requests_total,
+    http_request_duration_seconds,
+    http_requests_in_progress,
+    http_response_size_bytes,
+    http_request_db_queries,
+    http_request_db_seconds,
+]
+
+
+def render_metrics(metrics) -> str:
+    return "\n".join(line for metric in metrics for line in metric.render()) + "\n"
+
+
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+
+query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def instrument_engine(engine):
+    """Adds each query's count and time to the current request's QueryStats."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        started = conn.info["query_started_at"].pop()
+        stats = query_stats.get()
+        if stats is not None:
+            stats.count += 1
+            stats.seconds += time.perf_counter() - started
+
+
+class MetricsMiddleware:
+    """Records per-request HTTP and database metrics, labeled by the matched
+    route's path template so ``/posts/{post_id}/`` is one series, not one per id.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        stats = QueryStats()
+        token = query_stats.set(stats)
+        http_requests_in_progress.inc((method,))
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_requests_in_progress.dec((method,))
+            query_stats.reset(token)
+
+            # Unmatched paths share one series, so 404 scans cannot blow up
+            # the number of labels.
+            route = scope.get("route")
+            template = getattr(route, "path", "unmatched")
+            labels = (method, template)
+            http_requests_total.inc((method, template, str(status)))
+            http_request_duration_seconds.observe(labels, elapsed)
+            http_response_size_bytes.observe(labels, size)
+            http_request_db_queries.observe(labels, stats.count)
+            http_request_db_seconds.observe(labels, stats.seconds)
@@ -2,15 +2,21 @@ from datetime import datetime
 
 from sqlalchemy import (
     BigInteger,
+    Computed,
     Integer,
     String,
     Boolean,
     Text,
+    UniqueConstraint,
     DateTime,
+    Float,
     ForeignKey,
+    Index,
     func,
+    text,
 )
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Mapped, mapped_column, query_expression, relationship
 
 from app.database import Base
 
@@ -29,6 +35,18 @@ class BaseModel(Base):
 
 class User(BaseModel):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_created_at", "created_at"),
+        Index(
+            "ix_users_active_id", text("id DESC"), postgresql_where=text("is_active")
+        ),
+        Index(
+            "ix_users_first_name_trgm",
+            "first_name",
+            postgresql_using="gin",
+            postgresql_ops={"first_name": "gin_trgm_ops"},
+        ),
+    )
 
     email: Mapped[str] = mapped_column(String(50), unique=True, nullable=True)
     password_hash: Mapped[str] = mapped_column(String(100), nullable=False)
@@ -61,6 +79,39 @@ class User(BaseModel):
 
 class Post(BaseModel):
     __tablename__ = "post"
+    __table_args__ = (
+        Index("ix_post_created_at_id", text("created_at DESC"), text("id DESC")),
+        Index(
+            "ix_post_active_created_at_id",
+            text("created_at DESC"),
+            text("id DESC"),
+            postgresql_where=text("is_active"),
+        ),
+        Index(
+            "ix_post_user_id_created_at_id",
+            "user_id",
+            text("created_at DESC"),
+            text("id DESC"),
+        ),
+        Index(
+            "ix_post_category_id_created_at_id",
+            "category_id",
+            text("created_at DESC"),
+            text("id DESC"),
+        ),
+        Index("ix_post_likes_count_id", text("likes_count DESC"), text("id DESC")),
+        Index("ix_post_views_count_id", text("views_count DESC"), text("id DESC")),
+        Index(
+            "ix_post_comments_count_id", text("comments_count DESC"), text("id DESC")
+        ),
+        Index("ix_post_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_post_slug_trgm",
+            "slug",
+            postgresql_using="gin",
+            postgresql_ops={"slug": "gin_trgm_ops"},
+        ),
+    )
 
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
     title: Mapped[str] = mapped_column(String(255))
@@ -72,6 +123,17 @@ class Post(BaseModel):
     comments_count: Mapped[int] = mapped_column(BigInteger, default=0)
     mins_read: Mapped[int] = mapped_column(BigInteger, default=0)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(body, ''))",
+            persisted=True,
+        ),
+        nullable=True,
+        deferred=True,
+    )
+    # Filled in per query with with_expression(), e.g. a prefix of the body.
+    excerpt: Mapped[str | None] = query_expression()
 
     user: Mapped["User"] = relationship(
         "User", back_populates="posts", lazy="raise_on_sql"
@@ -98,10 +160,22 @@ class Post(BaseModel):
 
 class Category(Base):
     __tablename__ = "categories"
+    __table_args__ = (
+        Index(
+            "ix_categories_slug_trgm",
+            "slug",
+            postgresql_using="gin",
+            postgresql_ops={"slug": "gin_trgm_ops"},
+        ),
+    )
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     name: Mapped[str] = mapped_column(String(50))
     slug: Mapped[str] = mapped_column(String(100), unique=True)
+    posts_count: Mapped[int] = mapped_column(BigInteger, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=func.now(), onupdate=func.now()
+    )
 
     posts: Mapped[list["Post"]] = relationship(
         "Post", back_populates="category", lazy="raise_on_sql"
@@ -113,10 +187,22 @@ class Category(Base):
 
 class Tag(Base):
     __tablename__ = "tags"
+    __table_args__ = (
+        Index(
+            "ix_tags_slug_trgm",
+            "slug",
+            postgresql_using="gin",
+            postgresql_ops={"slug": "gin_trgm_ops"},
+        ),
+    )
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     name: Mapped[str] = mapped_column(String(50))
     slug: Mapped[str] = mapped_column(String(100), unique=True)
+    posts_count: Mapped[int] = mapped_column(BigInteger, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=func.now(), onupdate=func.now()
+    )
 
     posts: Mapped[list["Post"]] = relationship(
         secondary="post_tags", back_populates="tags", lazy="raise_on_sql"
@@ -130,7 +216,9 @@ class PostTag(Base):
     __tablename__ = "post_tags"
 
     post_id: Mapped[int] = mapped_column(ForeignKey("post.id"), primary_key=True)
-    tag_id: Mapped[int] = mapped_column(ForeignKey("tags.id"), primary_key=True)
+    tag_id: Mapped[int] = mapped_column(
+        ForeignKey("tags.id"), primary_key=True, index=True
+    )
 
 
 class Profession(Base):
@@ -167,6 +255,9 @@ class PostMedia(Base):
 
 class Comment(BaseModel):
     __tablename__ = "comments"
+    __table_args__ = (
+        Index("ix_comments_post_id_created_at_id", "post_id", "created_at", "id"),
+    )
 
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=True)
     text: Mapped[str] = mapped_column(Text)
@@ -188,7 +279,7 @@ class UserSearch(Base):
     __tablename__ = "user_searches"
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
-    term: Mapped[str] = mapped_column(String(50), nullable=False)
+    term: Mapped[str] = mapped_column(String(50), nullable=False, unique=True)
     count: Mapped[int] = mapped_column(Integer, default=0)
 
     def __repr__(self):
@@ -213,13 +304,16 @@ class Device(BaseModel):
 
 class Like(Base):
     __tablename__ = "likes"
+    __table_args__ = (
+        UniqueConstraint("device_id", "post_id", name="uq_likes_device_id_post_id"),
+    )
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     device_id: Mapped[int] = mapped_column(ForeignKey("devices.id"))
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=func.now()
     )
-    post_id: Mapped[int] = mapped_column(ForeignKey("post.id"))
+    post_id: Mapped[int] = mapped_column(ForeignKey("post.id"), index=True)
 
     device: Mapped["Device"] = relationship(
         "Device", back_populates="likes", lazy="raise_on_sql"
@@ -230,3 +324,19 @@ class Like(Base):
 
     def __repr__(self):
         return f"Like({self.id})"
+
+
+class PostTrending(Base):
+    __tablename__ = "post_trending"
+    __table_args__ = (Index("ix_post_trending_score", text("score DESC")),)
+
+    post_id: Mapped[int] = mapped_column(
+        ForeignKey("post.id", ondelete="CASCADE"), primary_key=True
+    )
+    score: Mapped[float] = mapped_column(Float, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=func.now()
+    )
+
+    def __repr__(self):
+        return f"PostTrending({self.post_id}, {self.score})"
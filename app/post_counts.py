@@ -0,0 +1,117 @@
+import asyncio
+import logging
+import os
+from collections import Counter
+
+from dotenv import load_dotenv
+from sqlalchemy import BigInteger, column, func, select, update, values
+
+from app.cache import categories_cache, tags_cache
+from app.database import AsyncSessionLocal
+from app.models import Category, Post, PostTag, Tag, User
+
+load_dotenv()
+
+POST_COUNTS_RECONCILE_INTERVAL = float(
+    os.getenv("POST_COUNTS_RECONCILE_INTERVAL", 3600)
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def apply_posts_count(session, model, deltas: Counter):
+    """Adds ``deltas`` (id -> change) to ``model.posts_count`` in one UPDATE."""
+    # Sorted ids make concurrent writers lock rows in the same order.
+    deltas = sorted((id, n) for id, n in deltas.items() if id is not None and n)
+    if not deltas:
+        return
+
+    batch = values(column("id", BigInteger), column("n", BigInteger), name="v").data(
+        deltas
+    )
+    stmt = (
+        update(model.__table__)
+        .values({model.posts_count.key: model.posts_count + batch.c.n})
+        .where(model.id == batch.c.id)
+    )
+    await session.execute(stmt)
+
+
+async def change_post_counts(session, posts, delta: int):
+    """Counts ``posts``, given as ``(user_id, category_id, tag_ids)``, in or out
+    of their author's, category's and tags' ``posts_count``.
+    """
+    users, categories, tags = Counter(), Counter(), Counter()
+    for user_id, category_id, tag_ids in posts:
+        users[user_id] += delta
+        categories[category_id] += delta
+        tags.update({tag_id: delta for tag_id in tag_ids})
+
+    await apply_posts_count(session, User, users)
+    await apply_posts_count(session, Category, categories)
+    await apply_posts_count(session, Tag, tags)
+
+
+def clear_taxonomy_caches():
+    # posts_count is part of the category and tag responses.
+    categories_cache.clear()
+    tags_cache.clear()
+
+
+async def reconcile_post_counts(session):
+    """Rewrites every ``posts_count`` that drifted from the real count, e.g.
+    after a failed request or a change made outside the API.
+    """
+    sources = (
+        (User, select(func.count()).where(Post.user_id == User.id)),
+        (Category, select(func.count()).where(Post.category_id == Category.id)),
+        (Tag, select(func.count()).where(PostTag.tag_id == Tag.id)),
+    )
+    for model, count in sources:
+        count = count.scalar_subquery()
+        stmt = (
+            update(model)
+            .values(posts_count=count)
+            .where(model.posts_count.is_distinct_from(count))
+        )
+        await session.execute(stmt)
+
+    await session.commit()
+    clear_taxonomy_caches()
+
+
+class PostCountReconciler:
+    def __init__(
+        self,
+        interval: float = POST_COUNTS_RECONCILE_INTERVAL,
+        session_factory=AsyncSessionLocal,
+    ):
+        self.interval = interval
+        self.session_factory = session_factory
+        self._task = None
+
+    async def reconcile(self):
+        try:
+            async with self.session_factory() as session:
+                await reconcile_post_counts(session)
+        except Exception:
+            logger.exception("Failed to reconcile post counts")
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.reconcile()
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+
+post_count_reconciler = PostCountReconciler()
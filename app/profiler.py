@@ -0,0 +1,191 @@
+import itertools
+import json
+import logging
+import os
+import re
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+
+from dotenv import load_dotenv
+from sqlalchemy import event
+
+load_dotenv()
+
+SQL_PROFILER = os.getenv("SQL_PROFILER", "0").lower() in ("1", "true", "yes")
+SQL_PROFILER_SLOW_MS = float(os.getenv("SQL_PROFILER_SLOW_MS", 100))
+SQL_PROFILER_REPEAT_THRESHOLD = int(os.getenv("SQL_PROFILER_REPEAT_THRESHOLD", 5))
+SQL_PROFILER_SEQ_SCAN_ROWS = int(os.getenv("SQL_PROFILER_SEQ_SCAN_ROWS", 1000))
+SQL_PROFILER_HISTORY = int(os.getenv("SQL_PROFILER_HISTORY", 50))
+
+PLACEHOLDER = re.compile(r"\$\d+|%\(\w+\)s|%s")
+PLACEHOLDER_LIST = re.compile(r"\(\?(?:, \?)+\)")
+
+logger = logging.getLogger(__name__)
+
+
+def statement_shape(statement: str) -> str:
+    """The statement with placeholders and expanded IN lists folded, so one
+    query issued per row of a page shows up as the same shape.
+    """
+    shape = " ".join(statement.split())
+    shape = PLACEHOLDER.sub("?", shape)
+    return PLACEHOLDER_LIST.sub("(?)", shape)
+
+
+class QueryRecord:
+    def __init__(self, statement: str, parameters, many: bool, duration: float):
+        self.statement = statement
+        self.parameters = parameters
+        self.many = many
+        self.duration = duration
+        self.shape = statement_shape(statement)
+
+
+class RequestProfile:
+    _ids = itertools.count(1)
+
+    def __init__(self, method: str, path: str):
+        self.id = next(self._ids)
+        self.method = method
+        self.path = path
+        self.queries: list[QueryRecord] = []
+        self.missing_indexes = []
+
+    def summary(self):
+        shapes = Counter(query.shape for query in self.queries)
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "queries": len(self.queries),
+            "total_ms": round(sum(q.duration for q in self.queries) * 1000, 2),
+            "repeated": [
+                {"statement": shape, "count": n}
+                for shape, n in shapes.most_common()
+                if n >= SQL_PROFILER_REPEAT_THRESHOLD
+            ],
+            "slow": [
+                {"statement": query.shape, "ms": round(query.duration * 1000, 2)}
+                for query in self.queries
+                if query.duration * 1000 >= SQL_PROFILER_SLOW_MS
+            ],
+            "missing_indexes": self.missing_indexes,
+        }
+
+    def headers(self):
+        summary = self.summary()
+        return [
+            (b"x-sql-profile-id", str(self.id).encode()),
+            (b"x-sql-queries", str(summary["queries"]).encode()),
+            (b"x-sql-time-ms", str(summary["total_ms"]).encode()),
+            (b"x-sql-repeated", str(len(summary["repeated"])).encode()),
+            (b"x-sql-slow", str(len(summary["slow"])).encode()),
+        ]
+
+
+current_profile: ContextVar[RequestProfile | None] = ContextVar(
+    "current_profile", default=None
+)
+profiles: deque[RequestProfile] = deque(maxlen=SQL_PROFILER_HISTORY)
+
+
+def install(engine):
+    """Records every statement run on ``engine`` into the current request's
+    profile. Only installed when ``SQL_PROFILER`` is on.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        conn.info.setdefault("profile_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        started = conn.info["profile_started_at"].pop()
+        profile = current_profile.get()
+        if profile is not None:
+            duration = time.perf_counter() - started
+            profile.queries.append(QueryRecord(statement, parameters, many, duration))
+
+
+def iter_plan_nodes(node):
+    yield node
+    for child in node.get("Plans", ()):
+        yield from iter_plan_nodes(child)
+
+
+async def explain(engine, profile: RequestProfile):
+    """Runs a plain EXPLAIN, which does not execute the query, once per SELECT
+    shape and flags sequential scans the planner expects to read many rows.
+    """
+    seen = set()
+    async with engine.connect() as conn:
+        for query in profile.queries:
+            if query.many or query.shape in seen:
+                continue
+            if not query.shape.upper().startswith(("SELECT", "WITH")):
+                continue
+            seen.add(query.shape)
+
+            try:
+                res = await conn.exec_driver_sql(
+                    f"EXPLAIN (FORMAT JSON) {query.statement}", query.parameters
+                )
+                plan = res.scalar()
+            except Exception:
+                logger.exception("Failed to explain %s", query.shape)
+                await conn.rollback()
+                continue
+
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            for node in iter_plan_nodes(plan[0]["Plan"]):
+                if (
+                    node["Node Type"] == "Seq Scan"
+                    and node.get("Plan Rows", 0) >= SQL_PROFILER_SEQ_SCAN_ROWS
+                ):
+                    profile.missing_indexes.append(
+                        {
+                            "statement": query.shape,
+                            "relation": node.get("Relation Name"),
+                            "filter": node.get("Filter"),
+                            "rows": node["Plan Rows"],
+                        }
+                    )
+
+
+class SQLProfilerMiddleware:
+    """Attributes queries to the request that ran them and reports a summary
+    in ``X-SQL-*`` response headers, with details under ``/debug/sql/``.
+
+    Headers cover the queries run before the response started; the EXPLAIN
+    pass runs after the response is sent and only shows up in the history.
+    """
+
+    def __init__(self, app, engine):
+        self.app = app
+        self.engine = engine
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith("/debug/"):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(scope["method"], scope["path"])
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *profile.headers()]
+            await send(message)
+
+        token = current_profile.set(profile)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_profile.reset(token)
+            profiles.append(profile)
+
+        try:
+            await explain(self.engine, profile)
+        except Exception:
+            logger.exception("Failed to explain queries for %s", profile.path)
@@ -3,6 +3,11 @@ from .categories import router as category_router
 from .tags import router as tag_router
 from .users import router as user_router
 from .comments import router as comment_router
+from .likes import router as like_router
+from .export import router as export_router
+from .cache import router as cache_router
+from .metrics import router as metrics_router
+from .debug import router as debug_router
 
 __all__ = [
     "posts_router",
@@ -10,4 +15,9 @@ __all__ = [
     "tag_router",
     "user_router",
     "comment_router",
+    "like_router",
+    "export_router",
+    "cache_router",
+    "metrics_router",
+    "debug_router",
 ]
@@ -0,0 +1,10 @@
+from fastapi import APIRouter
+
+from app.cache import caches
+
+router = APIRouter(prefix="/cache", tags=["Cache"])
+
+
+@router.get("/stats/")
+async def get_cache_stats():
+    return {name: cache.stats() for name, cache in caches.items()}
@@ -1,36 +1,80 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from sqlalchemy import select
 
+from app.cache import categories_cache
 from app.models import Category
-from app.database import db_dep
+from app.database import async_db_dep
 from app.schemas import (
     CategoryCreateRequest,
     CategoryUpdateRequest,
     CategoryListResponse,
 )
-from app.utils import generate_slug
+from app.utils import (
+    generate_slug,
+    similar_lookup,
+    make_etag,
+    validator_headers,
+    is_not_modified,
+)
 
 router = APIRouter(prefix="/categories", tags=["Categories"])
 
 
 @router.get("/list/", response_model=list[CategoryListResponse])
-async def get_post_list(session: db_dep):
-    stmt = select(Category)
-    res = session.execute(stmt)
-    category = res.scalars().all()
-
-    if not category:
+async def get_post_list(session: async_db_dep, request: Request, response: Response):
+    category = categories_cache.get("list")
+    if category is None:
+        stmt = select(Category)
+        res = await session.execute(stmt)
+        rows = res.scalars().all()
+        category = {
+            "items": [
+                CategoryListResponse.model_validate(
+                    obj, from_attributes=True
+                ).model_dump()
+                for obj in rows
+            ],
+            "etag": make_etag(
+                *(f"{obj.id}:{obj.updated_at.isoformat()}" for obj in rows)
+            ),
+            "last_modified": max((obj.updated_at for obj in rows), default=None),
+        }
+        categories_cache.set("list", category)
+
+    if not category["items"]:
         raise HTTPException(status_code=404, detail="Post not found")
 
-    return category
+    headers = validator_headers(category["etag"], category["last_modified"])
+    if is_not_modified(request, category["etag"], category["last_modified"]):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return category["items"]
 
 
 @router.get("/{slug}/", response_model=CategoryListResponse)
-async def get_post(session: db_dep, slug: str):
-    stmt = select(Category).where(Category.slug.like(f"%{slug}%"))
-    res = session.execute(stmt)
+async def get_post(
+    session: async_db_dep,
+    request: Request,
+    response: Response,
+    slug: str,
+    fuzzy: bool = True,
+):
+    stmt = select(Category).where(Category.slug == slug)
+    res = await session.execute(stmt)
     category = res.scalars().first()
 
+    if category:
+        etag = make_etag(category.id, category.updated_at.isoformat())
+        headers = validator_headers(etag, category.updated_at)
+
+        if is_not_modified(request, etag, category.updated_at):
+            return Response(status_code=304, headers=headers)
+
+        response.headers.update(headers)
+    elif fuzzy:
+        category = await similar_lookup(session, Category, Category.slug, slug)
+
     if not category:
         raise HTTPException(status_code=404, detail="Post not found")
 
@@ -38,22 +82,23 @@ async def get_post(session: db_dep, slug: str):
 
 
 @router.post("/create/", response_model=CategoryCreateRequest)
-async def create_category(session: db_dep, create_data: CategoryCreateRequest):
+async def create_category(session: async_db_dep, create_data: CategoryCreateRequest):
     category = Category(name=create_data.name, slug=generate_slug(create_data.name))
 
     session.add(category)
-    session.commit()
-    session.refresh(category)
+    await session.commit()
+    categories_cache.clear()
+    await session.refresh(category)
 
     return category
 
 
 @router.put("/{categy_id}", response_model=CategoryUpdateRequest)
 async def update_category_put(
-    session: db_dep, category_id: int, update_data: CategoryUpdateRequest
+    session: async_db_dep, category_id: int, update_data: CategoryUpdateRequest
 ):
     stmt = select(Category).where(Category.id == category_id)
-    res = session.execute(stmt)
+    res = await session.execute(stmt)
     category = res.scalars().first()
 
     if not category:
@@ -62,19 +107,20 @@ async def update_category_put(
     category.name = update_data.name
     category.slug = generate_slug(update_data.name)
 
-    session.commit()
-    session.refresh(category)
+    await session.commit()
+    categories_cache.clear()
+    await session.refresh(category)
 
     return category
 
 
 @router.patch("/{categy_id}", response_model=CategoryUpdateRequest)
 async def update_category(
-    session: db_dep, category_id: int, update_data: CategoryUpdateRequest
+    session: async_db_dep, category_id: int, update_data: CategoryUpdateRequest
 ):
     stmt = select(Category).where(Category.id == category_id)
-    res = session.execute(stmt)
-    category = res.scalar().first()
+    res = await session.execute(stmt)
+    category = res.scalars().first()
 
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
@@ -82,20 +128,22 @@ async def update_category(
     category.name = update_data.name
     category.slug = generate_slug(update_data.name)
 
-    session.commit()
-    session.refresh(category)
+    await session.commit()
+    categories_cache.clear()
+    await session.refresh(category)
 
     return category
 
 
 @router.delete("/{category_id}")
-async def delete_category(session: db_dep, category_id: int):
+async def delete_category(session: async_db_dep, category_id: int):
     stmt = select(Category).where(Category.id == category_id)
-    res = session.execute(stmt)
-    category = res.scalar().first()
+    res = await session.execute(stmt)
+    category = res.scalars().first()
 
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
 
-    session.delete(category)
-    session.commit()
+    await session.delete(category)
+    await session.commit()
+    categories_cache.clear()
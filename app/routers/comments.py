@@ -1,21 +1,89 @@
-from fastapi import APIRouter
+from datetime import datetime
 
-from app.models import Comment
-from app.database import db_dep
-from app.schemas import CommentCreateRequest
+from fastapi import APIRouter, HTTPException, Query
+from sqlalchemy import select, tuple_, update
+
+from app.models import Comment, Post
+from app.database import async_db_dep
+from app.schemas import CommentCreateRequest, CommentListresponse, CommentPageResponse
+from app.trending import touch_trending
+from app.utils import encode_cursor, decode_cursor
 
 
 router = APIRouter(prefix="/comments", tags=["Comments"])
 
 
-@router.post("/create/")
-async def create_comment(session: db_dep, create_data: CommentCreateRequest):
+def change_comments_count(post_id: int, delta: int):
+    # Keep updated_at: a new comment must not change the post's ETag.
+    return (
+        update(Post)
+        .where(Post.id == post_id)
+        .values(
+            comments_count=Post.comments_count + delta,
+            updated_at=Post.updated_at,
+        )
+    )
+
+
+@router.get("/post/{post_id}/", response_model=CommentPageResponse)
+async def get_post_comments(
+    session: async_db_dep,
+    post_id: int,
+    cursor: str | None = None,
+    limit: int = Query(20, ge=1, le=100),
+):
+    stmt = select(Comment).where(Comment.post_id == post_id, Comment.is_active)
+
+    if cursor:
+        try:
+            created_at, comment_id = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        if not isinstance(created_at, datetime):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        stmt = stmt.where(
+            tuple_(Comment.created_at, Comment.id) > (created_at, comment_id)
+        )
+
+    stmt = stmt.order_by(Comment.created_at, Comment.id).limit(limit + 1)
+    res = await session.execute(stmt)
+    comments = res.scalars().all()
+
+    next_cursor = None
+    if len(comments) > limit:
+        comments = comments[:limit]
+        next_cursor = encode_cursor(comments[-1].created_at, comments[-1].id)
+
+    return {"items": comments, "next_cursor": next_cursor}
+
+
+@router.post("/create/", response_model=CommentListresponse)
+async def create_comment(session: async_db_dep, create_data: CommentCreateRequest):
     comment = Comment(
         user_id=create_data.user_id, text=create_data.text, post_id=create_data.post_id
     )
 
     session.add(comment)
-    session.commit()
-    session.refresh(comment)
+    await session.execute(change_comments_count(create_data.post_id, 1))
+    await session.commit()
+    touch_trending([create_data.post_id])
+    await session.refresh(comment)
 
     return comment
+
+
+@router.delete("/{comment_id}/")
+async def delete_comment(session: async_db_dep, comment_id: int):
+    stmt = select(Comment).where(Comment.id == comment_id)
+    res = await session.execute(stmt)
+    comment = res.scalars().first()
+
+    if not comment:
+        raise HTTPException(status_code=404, detail="Comment not found")
+
+    await session.delete(comment)
+    await session.execute(change_comments_count(comment.post_id, -1))
+    await session.commit()
+    touch_trending([comment.post_id])
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, HTTPException
+
+from app.profiler import profiles
+
+router = APIRouter(prefix="/debug", tags=["Debug"])
+
+
+@router.get("/sql/")
+async def get_sql_profiles():
+    return [profile.summary() for profile in reversed(profiles)]
+
+
+@router.get("/sql/{profile_id}/")
+async def get_sql_profile(profile_id: int):
+    for profile in profiles:
+        if profile.id == profile_id:
+            return {
+                **profile.summary(),
+                "statements": [
+                    {"statement": query.shape, "ms": round(query.duration * 1000, 2)}
+                    for query in profile.queries
+                ],
+            }
+
+    raise HTTPException(status_code=404, detail="Profile not found")
@@ -0,0 +1,115 @@
+import csv
+import io
+import json
+from enum import Enum
+
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+
+from app.database import AsyncSessionLocal
+from app.models import Post, User
+
+router = APIRouter(prefix="/export", tags=["Export"])
+
+EXPORT_BATCH_SIZE = 1000
+
+POST_COLUMNS = [
+    Post.id,
+    Post.user_id,
+    Post.category_id,
+    Post.title,
+    Post.slug,
+    Post.body,
+    Post.views_count,
+    Post.likes_count,
+    Post.comments_count,
+    Post.mins_read,
+    Post.is_active,
+    Post.created_at,
+    Post.updated_at,
+]
+
+USER_COLUMNS = [
+    User.id,
+    User.email,
+    User.first_name,
+    User.last_name,
+    User.profession_id,
+    User.bio,
+    User.posts_count,
+    User.is_active,
+    User.is_staff,
+    User.is_superuser,
+    User.created_at,
+]
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+def encode_ndjson(rows) -> str:
+    return "".join(
+        json.dumps(row._asdict(), default=lambda value: value.isoformat()) + "\n"
+        for row in rows
+    )
+
+
+def encode_csv(rows) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+async def stream_export(stmt, format: ExportFormat):
+    # The request's session may be closed before the body is sent, so the
+    # stream owns its session and server-side cursor.
+    async with AsyncSessionLocal() as session:
+        result = await session.stream(
+            stmt.execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+
+        if format == ExportFormat.csv:
+            yield encode_csv([list(result.keys())])
+
+        async for rows in result.partitions():
+            yield (
+                encode_csv(rows) if format == ExportFormat.csv else encode_ndjson(rows)
+            )
+
+
+def export_response(stmt, format: ExportFormat, name: str):
+    media_type = "text/csv" if format == ExportFormat.csv else "application/x-ndjson"
+    return StreamingResponse(
+        stream_export(stmt, format),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{name}.{format.value}"'
+        },
+    )
+
+
+@router.get("/posts/")
+async def export_posts(
+    format: ExportFormat = ExportFormat.ndjson, is_active: bool | None = None
+):
+    stmt = select(*POST_COLUMNS)
+
+    if is_active is not None:
+        stmt = stmt.where(Post.is_active == is_active)
+
+    return export_response(stmt.order_by(Post.id), format, "posts")
+
+
+@router.get("/users/")
+async def export_users(
+    format: ExportFormat = ExportFormat.ndjson, is_active: bool | None = None
+):
+    stmt = select(*USER_COLUMNS)
+
+    if is_active is not None:
+        stmt = stmt.where(User.is_active == is_active)
+
+    return export_response(stmt.order_by(User.id), format, "users")
@@ -0,0 +1,55 @@
+from fastapi import APIRouter, HTTPException
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+
+from app.counters import like_counter
+from app.models import Like
+from app.database import async_db_dep
+from app.schemas import LikeCreateRequest, LikeResponse
+
+router = APIRouter(prefix="/likes", tags=["Likes"])
+
+
+@router.post("/", response_model=LikeResponse)
+async def like_post(session: async_db_dep, create_data: LikeCreateRequest):
+    stmt = (
+        insert(Like)
+        .values(device_id=create_data.device_id, post_id=create_data.post_id)
+        .on_conflict_do_nothing(index_elements=[Like.device_id, Like.post_id])
+        .returning(Like.id)
+    )
+
+    try:
+        res = await session.execute(stmt)
+        like_id = res.scalar()
+        await session.commit()
+    except IntegrityError:
+        raise HTTPException(status_code=404, detail="Post or device not found")
+
+    # likes_count is reconciled in batches; a repeated like inserts nothing.
+    if like_id is not None:
+        like_counter.record(create_data.post_id)
+
+    return {
+        "device_id": create_data.device_id,
+        "post_id": create_data.post_id,
+        "liked": True,
+    }
+
+
+@router.delete("/", response_model=LikeResponse)
+async def unlike_post(session: async_db_dep, device_id: int, post_id: int):
+    stmt = (
+        delete(Like)
+        .where(Like.device_id == device_id, Like.post_id == post_id)
+        .returning(Like.id)
+    )
+    res = await session.execute(stmt)
+    like_id = res.scalar()
+    await session.commit()
+
+    if like_id is not None:
+        like_counter.record(post_id, -1)
+
+    return {"device_id": device_id, "post_id": post_id, "liked": False}
@@ -0,0 +1,41 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.database import InstrumentedPool, hold_time, pool_stats
+from app.metrics import Metric, http_metrics, render_metrics
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+def build_pool_metrics():
+    stats = pool_stats()
+    metrics = []
+    for key in ("size", "max_overflow", "checked_in", "checked_out", "overflow"):
+        metric = Metric(f"db_pool_{key}", f"Connection pool {key}.", "gauge")
+        metric.set((), stats[key])
+        metrics.append(metric)
+
+    timeouts = Metric(
+        "db_pool_timeouts_total", "Pool checkouts that timed out.", "counter"
+    )
+    timeouts.set((), stats["timeouts"])
+    wait_time = Metric(
+        "db_pool_wait_seconds", "Time spent waiting for a connection.", "histogram"
+    )
+    wait_time.values[()] = InstrumentedPool.wait_time
+    held = Metric(
+        "db_pool_hold_seconds", "Time a connection was checked out.", "histogram"
+    )
+    held.values[()] = hold_time
+    return [*metrics, timeouts, wait_time, held]
+
+
+@router.get("", response_class=PlainTextResponse)
+async def get_metrics():
+    content = render_metrics([*http_metrics, *build_pool_metrics()])
+    return PlainTextResponse(content, media_type="text/plain; version=0.0.4")
+
+
+@router.get("/pool/")
+async def get_pool_stats():
+    return pool_stats()
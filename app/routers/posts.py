@@ -1,92 +1,476 @@
+import re
+from collections import Counter
 from datetime import datetime
+from enum import Enum
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from sqlalchemy import exists, func, select, tuple_
+from sqlalchemy.orm import joinedload, load_only, selectinload, with_expression
+
+from app.bulk import BULK_BATCH_SIZE, import_posts, iter_lines
+from app.cache import posts_cache
+from app.models import Category, Post, PostTag, PostTrending, Tag
+from app.database import async_db_dep
+from app.schemas import (
+    PostListResponse,
+    PostPageResponse,
+    PostSummaryPageResponse,
+    PostExpandedPageResponse,
+    PostCreateRequest,
+    PostImportReport,
+    PostUpdateRequest,
+)
+from app.counters import search_counter, view_counter
+from app.post_counts import apply_posts_count, change_post_counts, clear_taxonomy_caches
+from app.trending import touch_trending
+from app.utils import (
+    generate_slug,
+    encode_cursor,
+    decode_cursor,
+    similar_lookup,
+    make_etag,
+    validator_headers,
+    is_not_modified,
+    dump_json,
+    parse_fields,
+)
 
-from fastapi import APIRouter, HTTPException
-from sqlalchemy import select
+router = APIRouter(prefix="/posts", tags=["Posts"])
 
-from app.models import Post, PostTag, Tag, User
-from app.database import db_dep
-from app.schemas import PostListResponse, PostCreateRequest, PostUpdateRequest
-from app.utils import generate_slug
+POST_EXCERPT_LENGTH = 200
+
+# Columns a client may pick with ``fields=``; the search vector stays internal.
+POST_FIELDS = (
+    "id",
+    "user_id",
+    "category_id",
+    "title",
+    "slug",
+    "body",
+    "views_count",
+    "likes_count",
+    "comments_count",
+    "mins_read",
+    "is_active",
+    "created_at",
+    "updated_at",
+)
+
+# Buffered counters change without touching updated_at.
+COUNTER_FIELDS = ("views_count", "likes_count", "comments_count")
+
+
+class PostSort(str, Enum):
+    created_at = "created_at"
+    likes_count = "likes_count"
+    views_count = "views_count"
+    comments_count = "comments_count"
+
+
+class TagMatch(str, Enum):
+    any = "any"
+    all = "all"
+
+
+class PostQuery:
+    """Composes post filters and a whitelisted keyset sort into one statement.
+
+    Every filter skips ``None`` and empty lists, so query parameters can be
+    passed straight through. Sorts are ``(key, id)`` keysets, each backed by a
+    matching composite index.
+    """
+
+    def __init__(self):
+        self.stmt = select(Post)
+
+    def equals(self, column, value):
+        if value is not None:
+            self.stmt = self.stmt.where(column == value)
+        return self
+
+    def one_of(self, column, values):
+        if values:
+            self.stmt = self.stmt.where(column.in_(values))
+        return self
+
+    def between(self, column, low=None, high=None, include_high: bool = True):
+        if low is not None:
+            self.stmt = self.stmt.where(column >= low)
+        if high is not None:
+            self.stmt = self.stmt.where(
+                column <= high if include_high else column < high
+            )
+        return self
+
+    def in_categories(self, slugs):
+        if slugs:
+            category_ids = select(Category.id).where(Category.slug.in_(slugs))
+            self.stmt = self.stmt.where(Post.category_id.in_(category_ids))
+        return self
+
+    def tagged(self, tag_ids=None, slugs=None, match: TagMatch = TagMatch.any):
+        # Semi-joins keep one row per post; joining post_tags would repeat a
+        # post once per tag and drop untagged posts from the unfiltered feed.
+        tags = [*(tag_ids or ())]
+        tags += [
+            select(Tag.id).where(Tag.slug == slug).scalar_subquery()
+            for slug in slugs or ()
+        ]
+        if not tags:
+            return self
+
+        if match == TagMatch.all:
+            for tag in tags:
+                self.stmt = self.stmt.where(
+                    exists().where(PostTag.post_id == Post.id, PostTag.tag_id == tag)
+                )
+        else:
+            self.stmt = self.stmt.where(
+                exists().where(PostTag.post_id == Post.id, PostTag.tag_id.in_(tags))
+            )
+        return self
+
+    def paginate(
+        self,
+        cursor: str | None,
+        limit: int,
+        sort: PostSort = PostSort.created_at,
+        descending: bool = True,
+    ):
+        column = getattr(Post, sort.value)
+
+        if cursor:
+            try:
+                value, post_id = decode_cursor(cursor, sort.value, descending)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+
+            # The cursor's ordering matches, so this only catches a forged one.
+            if isinstance(value, datetime) != (sort == PostSort.created_at):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+
+            key = tuple_(column, Post.id)
+            self.stmt = self.stmt.where(
+                key < (value, post_id) if descending else key > (value, post_id)
+            )
+
+        if descending:
+            self.stmt = self.stmt.order_by(column.desc(), Post.id.desc())
+        else:
+            self.stmt = self.stmt.order_by(column.asc(), Post.id.asc())
+
+        return self.stmt.limit(limit + 1)
+
+
+def build_feed_query(
+    is_active: bool | None,
+    category_id: int | None,
+    tag_id: int | None,
+    cursor: str | None,
+    limit: int,
+):
+    return (
+        PostQuery()
+        .equals(Post.is_active, is_active)
+        .equals(Post.category_id, category_id or None)
+        .tagged([tag_id] if tag_id else None)
+        .paginate(cursor, limit)
+    )
 
-router = APIRouter(prefix="/posts", tags=["Posts"])
 
+def build_feed_page(
+    posts, limit: int, sort: PostSort = PostSort.created_at, descending: bool = True
+):
+    next_cursor = None
+    if len(posts) > limit:
+        posts = posts[:limit]
+        last = posts[-1]
+        next_cursor = encode_cursor(
+            getattr(last, sort.value), last.id, sort.value, descending
+        )
+
+    return {"items": posts, "next_cursor": next_cursor}
 
-@router.get("/", response_model=list[PostListResponse])
+
+@router.get("/", response_model=PostPageResponse)
 async def get_posts_list(
-    session: db_dep,
+    session: async_db_dep,
+    request: Request,
+    response: Response,
     is_active: bool | None = None,
     category_id: int | None = None,
     tag_id: int | None = None,
+    cursor: str | None = None,
+    limit: int = Query(20, ge=1, le=100),
+    fast: bool = False,
+    fields: str | None = Query(
+        None, description="Comma separated post columns to return, e.g. id,title"
+    ),
 ):
-    stmt = (
-        select(Post)
-        .join(PostTag, Post.id == PostTag.post_id)
-        .join(Tag, PostTag.tag_id == Tag.id)
+    try:
+        names = parse_fields(fields, POST_FIELDS)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    # Validate against the ids and updated_at of the page before building it,
+    # plus any counters it returns, since those leave updated_at alone.
+    counters = [name for name in names or () if name in COUNTER_FIELDS]
+    stmt = build_feed_query(is_active, category_id, tag_id, cursor, limit)
+    res = await session.execute(
+        stmt.with_only_columns(
+            Post.id, Post.updated_at, *(getattr(Post, name) for name in counters)
+        )
+    )
+    rows = res.all()
+    etag = make_etag(fields or "", *(":".join(map(str, row)) for row in rows))
+    last_modified = None
+    if not counters:
+        last_modified = max((row.updated_at for row in rows), default=None)
+    headers = validator_headers(etag, last_modified)
+
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+
+    params = {
+        "is_active": is_active,
+        "category_id": category_id,
+        "tag_id": tag_id,
+        "cursor": cursor,
+        "limit": limit,
+        "fields": ",".join(names) if names else None,
+        # A cached page must match the validators it is served with.
+        "etag": etag,
+    }
+
+    if fast or names:
+        # Only the requested columns, or the response ones, cached as the
+        # encoded body itself. id and created_at are always read for the cursor.
+        names = names or list(PostListResponse.model_fields)
+
+        async def load_fast():
+            extra = [name for name in ("id", "created_at") if name not in names]
+            columns = [getattr(Post, name) for name in names + extra]
+            res = await session.execute(stmt.with_only_columns(*columns))
+            page = build_feed_page(res.all(), limit)
+            page["items"] = [
+                {name: getattr(row, name) for name in names} for row in page["items"]
+            ]
+            return dump_json(page).decode()
+
+        content = await posts_cache.get_or_load("list_fast", params, load_fast)
+        return Response(content, media_type="application/json", headers=headers)
+
+    async def load():
+        res = await session.execute(stmt)
+        page = build_feed_page(res.scalars().all(), limit)
+        return PostPageResponse.model_validate(page, from_attributes=True).model_dump(
+            mode="json"
+        )
+
+    return await posts_cache.get_or_load("list", params, load)
+
+
+@router.get("/summary/", response_model=PostSummaryPageResponse)
+async def get_posts_summary(
+    session: async_db_dep,
+    is_active: bool | None = None,
+    category_id: int | None = None,
+    tag_id: int | None = None,
+    cursor: str | None = None,
+    limit: int = Query(20, ge=1, le=100),
+):
+    # Listing pages only need the start of the body, so it is cut down in SQL
+    # instead of loading every full article.
+    stmt = build_feed_query(is_active, category_id, tag_id, cursor, limit).options(
+        load_only(
+            Post.title,
+            Post.slug,
+            Post.views_count,
+            Post.likes_count,
+            Post.comments_count,
+            Post.created_at,
+        ),
+        with_expression(Post.excerpt, func.substr(Post.body, 1, POST_EXCERPT_LENGTH)),
     )
+    res = await session.execute(stmt)
+    return build_feed_page(res.scalars().all(), limit)
 
-    if is_active is not None:
-        stmt = stmt.where(Post.is_active == is_active)
 
-    if category_id:
-        stmt = stmt.where(Post.category_id == category_id)
+@router.get("/expanded/", response_model=PostExpandedPageResponse)
+async def get_posts_list_expanded(
+    session: async_db_dep,
+    is_active: bool | None = None,
+    category_id: int | None = None,
+    tag_id: int | None = None,
+    cursor: str | None = None,
+    limit: int = Query(20, ge=1, le=100),
+):
+    # One query for the page with its author and category joined in, plus one
+    # selectin query each for tags and media, whatever the page size.
+    stmt = build_feed_query(is_active, category_id, tag_id, cursor, limit).options(
+        joinedload(Post.user),
+        joinedload(Post.category),
+        selectinload(Post.tags),
+        selectinload(Post.media),
+    )
+    res = await session.execute(stmt)
+    return build_feed_page(res.scalars().all(), limit)
+
+
+@router.get("/filter/", response_model=PostPageResponse)
+async def filter_posts(
+    session: async_db_dep,
+    id: list[int] = Query([]),
+    user_id: list[int] = Query([]),
+    category_id: list[int] = Query([]),
+    category: list[str] = Query([], description="Category slugs"),
+    tag_id: list[int] = Query([]),
+    tag: list[str] = Query([], description="Tag slugs"),
+    tag_match: TagMatch = TagMatch.any,
+    is_active: bool | None = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+    min_mins_read: int | None = Query(None, ge=0),
+    max_mins_read: int | None = Query(None, ge=0),
+    min_likes: int | None = Query(None, ge=0),
+    max_likes: int | None = Query(None, ge=0),
+    min_views: int | None = Query(None, ge=0),
+    max_views: int | None = Query(None, ge=0),
+    min_comments: int | None = Query(None, ge=0),
+    max_comments: int | None = Query(None, ge=0),
+    sort: PostSort = PostSort.created_at,
+    descending: bool = True,
+    cursor: str | None = None,
+    limit: int = Query(20, ge=1, le=100),
+):
+    # Every filter narrows the same keyset-paginated statement, so any
+    # combination is one round trip.
+    stmt = (
+        PostQuery()
+        .one_of(Post.id, id)
+        .one_of(Post.user_id, user_id)
+        .one_of(Post.category_id, category_id)
+        .in_categories(category)
+        .tagged(tag_id, tag, tag_match)
+        .equals(Post.is_active, is_active)
+        .between(Post.created_at, created_after, created_before, include_high=False)
+        .between(Post.mins_read, min_mins_read, max_mins_read)
+        .between(Post.likes_count, min_likes, max_likes)
+        .between(Post.views_count, min_views, max_views)
+        .between(Post.comments_count, min_comments, max_comments)
+        .paginate(cursor, limit, sort, descending)
+    )
+    res = await session.execute(stmt)
+    return build_feed_page(res.scalars().all(), limit, sort, descending)
+
+
+def search_terms(q: str) -> set[str]:
+    """The words a websearch query looks for, without its syntax: quotes and
+    other punctuation, ``or`` and ``-negated`` words are left out.
+    """
+    terms = set()
+    for token in q.lower().split():
+        if token == "or" or token.startswith("-"):
+            continue
+        terms.update(word[:50] for word in re.findall(r"\w+", token))
+    return terms
+
+
+def record_search_terms(q: str):
+    # Buffered, so popular terms don't serialize searches on one row.
+    for term in search_terms(q):
+        search_counter.record(term)
+
+
+@router.get("/search/", response_model=list[PostListResponse])
+async def search_posts(
+    session: async_db_dep,
+    q: str = Query(min_length=1, max_length=255),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+):
+    query = func.websearch_to_tsquery("simple", q)
+    rank = func.ts_rank(Post.search_vector, query)
 
-    if tag_id:
-        stmt = stmt.where(Tag.id == tag_id)
+    stmt = (
+        select(Post)
+        .where(Post.is_active, Post.search_vector.bool_op("@@")(query))
+        .order_by(rank.desc(), Post.id.desc())
+        .offset(offset)
+        .limit(limit)
+    )
+    res = await session.execute(stmt)
+    posts = res.scalars().all()
 
-    stmt = stmt.order_by(Post.created_at.desc())
-    res = session.execute(stmt)
-    return res.scalars().all()
+    if offset == 0:
+        record_search_terms(q)
 
+    return posts
 
-@router.get("/{user_id}", response_model=list[PostListResponse])
-async def filter_posts_by_author(session: db_dep, user_id: int):
-    stmt = select(Post).join(User, Post.user_id == User.id)
 
-    if user_id:
-        stmt = stmt.where(User.id == user_id)
-        stmt = stmt.order_by(Post.created_at.desc())
-        res = session.execute(stmt)
-        return res.scalars().all()
+@router.get("/trending/", response_model=list[PostListResponse])
+async def get_trending_posts(
+    session: async_db_dep, limit: int = Query(10, ge=1, le=100)
+):
+    stmt = (
+        select(Post)
+        .join(PostTrending, PostTrending.post_id == Post.id)
+        .where(Post.is_active)
+        .order_by(PostTrending.score.desc())
+        .limit(limit)
+    )
+    res = await session.execute(stmt)
+    return res.scalars().all()
 
 
 @router.get("/{slug}", response_model=PostListResponse)
-async def get_post(session: db_dep, slug: str):
-    stmt = select(Post).where(Post.slug.like(f"%{slug}%"))
-    res = session.execute(stmt)
-    post = res.scalars().first()
+async def get_post(
+    session: async_db_dep,
+    request: Request,
+    response: Response,
+    slug: str,
+    fuzzy: bool = True,
+):
+    stmt = select(Post.id, Post.updated_at).where(Post.slug == slug)
+    res = await session.execute(stmt)
+    row = res.first()
 
-    if not post:
-        raise HTTPException(status_code=404, detail="Post not found")
+    if row:
+        etag = make_etag(row.id, row.updated_at.isoformat())
+        headers = validator_headers(etag, row.updated_at)
 
-    return post
+        if is_not_modified(request, etag, row.updated_at):
+            view_counter.record(row.id)
+            return Response(status_code=304, headers=headers)
 
+        response.headers.update(headers)
 
-@router.get("/{created_at}/", response_model=list[PostListResponse])
-async def get_posts_by_created_at(session: db_dep, created_at: datetime):
-    stmt = select(Post).where(Post.created_at == created_at)
-    res = session.execute(stmt)
-    posts = res.scalars().all()
-    return posts
+    async def load():
+        if row:
+            post = await session.get(Post, row.id)
+        elif fuzzy:
+            post = await similar_lookup(session, Post, Post.slug, slug)
+        else:
+            post = None
 
+        if post:
+            return PostListResponse.model_validate(
+                post, from_attributes=True
+            ).model_dump(mode="json")
 
-@router.get("/{mins_read}/", response_model=list[PostListResponse])
-async def get_posts_by_mins_read(session: db_dep, mins_read: int):
-    stmt = select(Post).where(Post.mins_read == mins_read)
-    res = session.execute(stmt)
-    posts = res.scalars().all()
-    return posts
+    post = await posts_cache.get_or_load("detail", {"slug": slug, "fuzzy": fuzzy}, load)
 
+    if not post:
+        raise HTTPException(status_code=404, detail="Post not found")
 
-@router.get("/{likes_count}/", response_model=list[PostListResponse])
-async def get_posts_by_likes_count(session: db_dep, likes_count: int):
-    stmt = select(Post).where(Post.likes_count == likes_count)
-    res = session.execute(stmt)
-    posts = res.scalars().all()
-    return posts
+    view_counter.record(post["id"])
+    return post
 
 
 @router.post("/create/")
-async def post_create(session: db_dep, create_data: PostCreateRequest):
+async def post_create(session: async_db_dep, create_data: PostCreateRequest):
     post = Post(
         user_id=create_data.user_id,
         title=create_data.title,
@@ -97,43 +481,74 @@ async def post_create(session: db_dep, create_data: PostCreateRequest):
     )
 
     session.add(post)
-    session.commit()
-    session.refresh(post)
+    await change_post_counts(
+        session, [(create_data.user_id, create_data.category_id, ())], 1
+    )
+    await session.commit()
+    touch_trending([post.id])
+    await posts_cache.invalidate()
+    clear_taxonomy_caches()
+    await session.refresh(post)
 
     return post
 
 
+@router.post("/import/", response_model=PostImportReport)
+async def post_import(
+    request: Request, batch_size: int = Query(BULK_BATCH_SIZE, ge=1, le=5000)
+):
+    return await import_posts(iter_lines(request.stream()), batch_size)
+
+
 @router.put("/{post_id}/")
-async def post_update(session: db_dep, post_id: int, update_data: PostUpdateRequest):
+async def post_update(
+    session: async_db_dep, post_id: int, update_data: PostUpdateRequest
+):
     stmt = select(Post).where(Post.id == post_id)
-    res = session.execute(stmt)
+    res = await session.execute(stmt)
     post = res.scalars().first()
 
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
 
-    if update_data.titlez:
+    if update_data.title:
         post.title = update_data.title
         post.slug = generate_slug(update_data.title)
 
     if update_data.body:
         post.body = update_data.body
 
+    if update_data.category_id and update_data.category_id != post.category_id:
+        stmt = select(Category.id).where(Category.id == update_data.category_id)
+        res = await session.execute(stmt)
+        if res.first() is None:
+            raise HTTPException(status_code=404, detail="Category not found")
+
+        await apply_posts_count(
+            session,
+            Category,
+            Counter({post.category_id: -1, update_data.category_id: 1}),
+        )
+        post.category_id = update_data.category_id
+
     if update_data.is_active:
         post.is_active = update_data.is_active
 
-    session.commit()
-    session.refresh(post)
+    await session.commit()
+    touch_trending([post.id])
+    await posts_cache.invalidate()
+    clear_taxonomy_caches()
+    await session.refresh(post)
 
     return post
 
 
 @router.patch("/{post_id}/")
 async def post_update_patch(
-    session: db_dep, post_id: int, update_data: PostUpdateRequest
+    session: async_db_dep, post_id: int, update_data: PostUpdateRequest
 ):
     stmt = select(Post).where(Post.id == post_id)
-    res = session.execute(stmt)
+    res = await session.execute(stmt)
     post = res.scalars().first()
 
     if not post:
@@ -146,23 +561,47 @@ async def post_update_patch(
     if update_data.body:
         post.body = update_data.body
 
+    if update_data.category_id and update_data.category_id != post.category_id:
+        stmt = select(Category.id).where(Category.id == update_data.category_id)
+        res = await session.execute(stmt)
+        if res.first() is None:
+            raise HTTPException(status_code=404, detail="Category not found")
+
+        await apply_posts_count(
+            session,
+            Category,
+            Counter({post.category_id: -1, update_data.category_id: 1}),
+        )
+        post.category_id = update_data.category_id
+
     if update_data.is_active:
         post.is_active = update_data.is_active
 
-    session.commit()
-    session.refresh(post)
+    await session.commit()
+    touch_trending([post.id])
+    await posts_cache.invalidate()
+    clear_taxonomy_caches()
+    await session.refresh(post)
 
     return post
 
 
 @router.delete("/{post_id}/")
-async def post_delete(session: db_dep, post_id: int):
+async def post_delete(session: async_db_dep, post_id: int):
     stmt = select(Post).where(Post.id == post_id)
-    res = session.execute(stmt)
+    res = await session.execute(stmt)
     post = res.scalars().first()
 
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
 
-    session.delete(post)
-    session.commit()
+    res = await session.execute(
+        select(PostTag.tag_id).where(PostTag.post_id == post_id)
+    )
+    tag_ids = res.scalars().all()
+
+    await session.delete(post)
+    await change_post_counts(session, [(post.user_id, post.category_id, tag_ids)], -1)
+    await session.commit()
+    await posts_cache.invalidate()
+    clear_taxonomy_caches()
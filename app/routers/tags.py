@@ -1,32 +1,74 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from sqlalchemy import select
 
+from app.cache import tags_cache
 from app.models import Tag
-from app.database import db_dep
+from app.database import async_db_dep
 from app.schemas import TagCreateRequest, TagListResponse, TagUpdateRequest
-from app.utils import generate_slug
+from app.utils import (
+    generate_slug,
+    similar_lookup,
+    make_etag,
+    validator_headers,
+    is_not_modified,
+)
 
 router = APIRouter(prefix="/tag", tags=["Tags"])
 
 
 @router.get("/list/", response_model=list[TagListResponse])
-async def get_tag_list(session: db_dep):
-    stmt = select(Tag)
-    res = session.execute(stmt)
-    tag = res.scalars().all()
-
-    if not tag:
+async def get_tag_list(session: async_db_dep, request: Request, response: Response):
+    tag = tags_cache.get("list")
+    if tag is None:
+        stmt = select(Tag)
+        res = await session.execute(stmt)
+        rows = res.scalars().all()
+        tag = {
+            "items": [
+                TagListResponse.model_validate(obj, from_attributes=True).model_dump()
+                for obj in rows
+            ],
+            "etag": make_etag(
+                *(f"{obj.id}:{obj.updated_at.isoformat()}" for obj in rows)
+            ),
+            "last_modified": max((obj.updated_at for obj in rows), default=None),
+        }
+        tags_cache.set("list", tag)
+
+    if not tag["items"]:
         raise HTTPException(status_code=404, detail="Tag not found")
 
-    return tag
+    headers = validator_headers(tag["etag"], tag["last_modified"])
+    if is_not_modified(request, tag["etag"], tag["last_modified"]):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return tag["items"]
 
 
 @router.get("/{slug}", response_model=TagListResponse)
-async def get_tag(session: db_dep, slug: str):
-    stmt = select(Tag).where(Tag.slug.like(f"%{slug}%"))
-    res = session.execute(stmt)
+async def get_tag(
+    session: async_db_dep,
+    request: Request,
+    response: Response,
+    slug: str,
+    fuzzy: bool = True,
+):
+    stmt = select(Tag).where(Tag.slug == slug)
+    res = await session.execute(stmt)
     tag = res.scalars().first()
 
+    if tag:
+        etag = make_etag(tag.id, tag.updated_at.isoformat())
+        headers = validator_headers(etag, tag.updated_at)
+
+        if is_not_modified(request, etag, tag.updated_at):
+            return Response(status_code=304, headers=headers)
+
+        response.headers.update(headers)
+    elif fuzzy:
+        tag = await similar_lookup(session, Tag, Tag.slug, slug)
+
     if not tag:
         raise HTTPException(status_code=404, detail="Tag not found")
 
@@ -34,23 +76,26 @@ async def get_tag(session: db_dep, slug: str):
 
 
 @router.post("/create/", response_model=TagCreateRequest)
-async def tag_create(session: db_dep, create_data: TagCreateRequest):
+async def tag_create(session: async_db_dep, create_data: TagCreateRequest):
     tag = Tag(
         name=create_data.name,
         slug=generate_slug(create_data.name),
     )
 
     session.add(tag)
-    session.commit()
-    session.refresh(tag)
+    await session.commit()
+    tags_cache.clear()
+    await session.refresh(tag)
 
     return tag
 
 
 @router.put("{tag_id}", response_model=TagUpdateRequest)
-async def tag_update_put(session: db_dep, tag_id: int, update_data: TagUpdateRequest):
+async def tag_update_put(
+    session: async_db_dep, tag_id: int, update_data: TagUpdateRequest
+):
     stmt = select(Tag).where(Tag.id == tag_id)
-    res = session.execute(stmt)
+    res = await session.execute(stmt)
     tag = res.scalars().first()
 
     if not tag:
@@ -59,16 +104,17 @@ async def tag_update_put(session: db_dep, tag_id: int, update_data: TagUpdateReq
     tag.name = update_data.name
     tag.slug = generate_slug(update_data.name)
 
-    session.commit()
-    session.refresh(tag)
+    await session.commit()
+    tags_cache.clear()
+    await session.refresh(tag)
 
     return tag
 
 
 @router.patch("{tag_id}", response_model=TagUpdateRequest)
-async def tag_update(session: db_dep, tag_id: int, update_data: TagUpdateRequest):
+async def tag_update(session: async_db_dep, tag_id: int, update_data: TagUpdateRequest):
     stmt = select(Tag).where(Tag.id == tag_id)
-    res = session.execute(stmt)
+    res = await session.execute(stmt)
     tag = res.scalars().first()
 
     if not tag:
@@ -77,20 +123,22 @@ async def tag_update(session: db_dep, tag_id: int, update_data: TagUpdateRequest
     tag.name = update_data.name
     tag.slug = generate_slug(update_data.name)
 
-    session.commit()
-    session.refresh(tag)
+    await session.commit()
+    tags_cache.clear()
+    await session.refresh(tag)
 
     return tag
 
 
 @router.delete("{tag_id}")
-async def delete_tag_patch(session: db_dep, tag_id: int):
+async def delete_tag_patch(session: async_db_dep, tag_id: int):
     stmt = select(Tag).where(Tag.id == tag_id)
-    res = session.execute(stmt)
+    res = await session.execute(stmt)
     tag = res.scalars().first()
 
     if not tag:
         raise HTTPException(status_code=404, detail="Tag not found")
 
-    session.delete(tag)
-    session.commit()
+    await session.delete(tag)
+    await session.commit()
+    tags_cache.clear()
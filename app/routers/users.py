@@ -1,32 +1,55 @@
 from datetime import datetime
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from sqlalchemy import select
 
 from app.models import User
-from app.database import db_dep
+from app.database import async_db_dep
 from app.schemas import UserCreateRequest, UserListResponse, UserUpdateRequest
+from app.utils import fuzzy_lookup, json_response, parse_fields, response_columns
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
 
 @router.get("/list/", response_model=list[UserListResponse])
-async def get_users_list(session: db_dep):
-    stmt = select(User)
-    res = session.execute(stmt)
-    user = res.scalars().all()
+async def get_users_list(
+    session: async_db_dep,
+    fast: bool = False,
+    fields: str | None = Query(
+        None, description="Comma separated user columns to return, e.g. id,email"
+    ),
+):
+    try:
+        names = parse_fields(fields, UserListResponse.model_fields)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    if names:
+        fast = True
+        stmt = select(*(getattr(User, name) for name in names))
+        res = await session.execute(stmt)
+        user = res.all()
+    elif fast:
+        stmt = select(*response_columns(User, UserListResponse))
+        res = await session.execute(stmt)
+        user = res.all()
+    else:
+        stmt = select(User)
+        res = await session.execute(stmt)
+        user = res.scalars().all()
 
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
+    if fast:
+        return json_response(user)
+
     return user
 
 
 @router.get("/{name}/", response_model=UserListResponse)
-async def get_user(session: db_dep, name: str):
-    stmt = select(User).where(User.first_name.ilike(f"%{name}%"))
-    res = session.execute(stmt)
-    user = res.scalars().first()
+async def get_user(session: async_db_dep, name: str, fuzzy: bool = True):
+    user = await fuzzy_lookup(session, User, User.first_name, name, fuzzy)
 
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -35,33 +58,53 @@ async def get_user(session: db_dep, name: str):
 
 
 @router.get("/", response_model=list[UserListResponse])
-async def get_all_users(session: db_dep, is_active: bool = None):
-    stmt = select(User)
+async def get_all_users(
+    session: async_db_dep,
+    is_active: bool = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+    min_posts: int | None = Query(None, ge=0),
+    max_posts: int | None = Query(None, ge=0),
+    fields: str | None = Query(
+        None, description="Comma separated user columns to return, e.g. id,email"
+    ),
+):
+    try:
+        names = parse_fields(fields, UserListResponse.model_fields)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    if names:
+        stmt = select(*(getattr(User, name) for name in names))
+    else:
+        stmt = select(User)
 
     if is_active is not None:
         stmt = stmt.where(User.is_active == is_active)
 
-    stmt = stmt.order_by(User.id.desc())
-    res = session.execute(stmt)
-    return res.scalars().all()
+    if created_after is not None:
+        stmt = stmt.where(User.created_at >= created_after)
 
+    if created_before is not None:
+        stmt = stmt.where(User.created_at < created_before)
 
-@router.get("/{created_at}", response_model=list[UserListResponse])
-async def get_users_by_created_at(session: db_dep, created_at: datetime):
-    stmt = select(User).where(User.created_at == created_at)
-    res = session.execute(stmt)
-    return res.scalars().all()
+    if min_posts is not None:
+        stmt = stmt.where(User.posts_count >= min_posts)
+
+    if max_posts is not None:
+        stmt = stmt.where(User.posts_count <= max_posts)
+
+    stmt = stmt.order_by(User.id.desc())
+    res = await session.execute(stmt)
 
+    if names:
+        return json_response(res.all())
 
-@router.get("/{posts_count}/", response_model=list[UserListResponse])
-async def get_users_by_posts_count(session: db_dep, posts_count: int):
-    stmt = select(User).where(User.posts_count == posts_count)
-    res = session.execute(stmt)
     return res.scalars().all()
 
 
 @router.post("/create/")
-async def create_user(session: db_dep, create_data: UserCreateRequest):
+async def create_user(session: async_db_dep, create_data: UserCreateRequest):
     user = User(
         email=create_data.email,
         password_hash=create_data.password_hash,
@@ -75,16 +118,18 @@ async def create_user(session: db_dep, create_data: UserCreateRequest):
     )
 
     session.add(user)
-    session.commit()
-    session.refresh(user)
+    await session.commit()
+    await session.refresh(user)
 
     return user
 
 
 @router.put("/{user_id}/")
-async def update_user(session: db_dep, user_id: int, update_data: UserUpdateRequest):
+async def update_user(
+    session: async_db_dep, user_id: int, update_data: UserUpdateRequest
+):
     stmt = select(User).where(User.id == user_id)
-    res = session.execute(stmt)
+    res = await session.execute(stmt)
     user = res.scalars().first()
 
     if not user:
@@ -106,20 +151,20 @@ async def update_user(session: db_dep, user_id: int, update_data: UserUpdateRequ
     if update_data.is_superuser:
         user.is_superuser = update_data.is_superuser
 
-    session.commit()
-    session.refresh(user)
+    await session.commit()
+    await session.refresh(user)
 
     return user
 
 
 @router.delete("/{user_id}/")
-async def delete_user(session: db_dep, user_id: int):
+async def delete_user(session: async_db_dep, user_id: int):
     stmt = select(User).where(User.id == user_id)
-    res = session.execute(stmt)
+    res = await session.execute(stmt)
     user = res.scalars().first()
 
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    session.delete(user)
-    session.commit()
+    await session.delete(user)
+    await session.commit()
@@ -11,6 +11,22 @@ class PostCreateRequest(BaseModel):
     created_at: datetime | None = None
 
 
+class PostImportRequest(PostCreateRequest):
+    category_slug: str | None = None
+    tags: list[str] = []
+
+
+class PostImportError(BaseModel):
+    line: int
+    error: str
+
+
+class PostImportReport(BaseModel):
+    imported: int
+    failed: int
+    errors: list[PostImportError]
+
+
 class PostListResponse(BaseModel):
     id: int
     title: str
@@ -35,9 +51,31 @@ class PostListResponse(BaseModel):
     }
 
 
+class PostPageResponse(BaseModel):
+    items: list[PostListResponse]
+    next_cursor: str | None = None
+
+
+class PostSummaryResponse(BaseModel):
+    id: int
+    title: str
+    slug: str
+    excerpt: str | None = None
+    views_count: int
+    likes_count: int
+    comments_count: int
+    created_at: datetime
+
+
+class PostSummaryPageResponse(BaseModel):
+    items: list[PostSummaryResponse]
+    next_cursor: str | None = None
+
+
 class PostUpdateRequest(BaseModel):
     title: str | None = None
     body: str | None = None
+    category_id: int | None = None
     is_active: bool | None = None
 
 
@@ -54,9 +92,12 @@ class CategoryListResponse(BaseModel):
     id: int
     name: str
     slug: str
+    posts_count: int
 
     model_config = {
-        "json_schema_extra": {"examples": [{"id": 5, "name": "SPORT", "slug": "sport"}]}
+        "json_schema_extra": {
+            "examples": [{"id": 5, "name": "SPORT", "slug": "sport", "posts_count": 42}]
+        }
     }
 
 
@@ -73,14 +114,40 @@ class TagListResponse(BaseModel):
     id: int
     name: str
     slug: str
+    posts_count: int
 
     model_config = {
         "json_schema_extra": {
-            "examples": [{"id": 5, "name": "SIYOSAT", "slug": "siyosat"}]
+            "examples": [
+                {"id": 5, "name": "SIYOSAT", "slug": "siyosat", "posts_count": 17}
+            ]
         }
     }
 
 
+class PostAuthorResponse(BaseModel):
+    id: int
+    first_name: str | None = None
+    last_name: str | None = None
+
+
+class PostMediaResponse(BaseModel):
+    id: int
+    url: str
+
+
+class PostExpandedResponse(PostListResponse):
+    user: PostAuthorResponse
+    category: CategoryListResponse | None = None
+    tags: list[TagListResponse] = []
+    media: list[PostMediaResponse] = []
+
+
+class PostExpandedPageResponse(BaseModel):
+    items: list[PostExpandedResponse]
+    next_cursor: str | None = None
+
+
 class UserCreateRequest(BaseModel):
     email: str
     password_hash: str
@@ -144,9 +211,25 @@ class CommentCreateRequest(BaseModel):
 
 class CommentListresponse(BaseModel):
     id: int
-    user_id: int
+    user_id: int | None = None
     text: str
     post_id: int
     is_active: bool
     created_at: datetime
-    update_at: datetime
+    updated_at: datetime
+
+
+class CommentPageResponse(BaseModel):
+    items: list[CommentListresponse]
+    next_cursor: str | None = None
+
+
+class LikeCreateRequest(BaseModel):
+    device_id: int
+    post_id: int
+
+
+class LikeResponse(BaseModel):
+    device_id: int
+    post_id: int
+    liked: bool
@@ -0,0 +1,144 @@
+import asyncio
+import logging
+import math
+import os
+import time
+from datetime import timedelta
+
+from dotenv import load_dotenv
+from sqlalchemy import delete, func, or_, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.database import AsyncSessionLocal
+from app.models import Post, PostTrending
+
+load_dotenv()
+
+TRENDING_REFRESH_INTERVAL = float(os.getenv("TRENDING_REFRESH_INTERVAL", 60))
+TRENDING_FULL_REFRESH_INTERVAL = float(
+    os.getenv("TRENDING_FULL_REFRESH_INTERVAL", 3600)
+)
+TRENDING_HALF_LIFE_HOURS = float(os.getenv("TRENDING_HALF_LIFE_HOURS", 24))
+TRENDING_WINDOW_HOURS = float(os.getenv("TRENDING_WINDOW_HOURS", 168))
+
+LIKE_WEIGHT = 3
+COMMENT_WEIGHT = 5
+VIEW_WEIGHT = 1
+
+logger = logging.getLogger(__name__)
+
+# Posts whose score may have changed since the last refresh in this process.
+touched_posts: set[int] = set()
+
+
+def touch_trending(post_ids):
+    """Queues posts whose counters or visibility changed for the next refresh."""
+    touched_posts.update(post_ids)
+
+
+def trending_score():
+    """Log of ``engagement * exp(-decay * age)``, minus the part shared by all
+    posts at any given moment.
+
+    Dropping ``-decay * now`` leaves ``ln(engagement) + decay * created_at``,
+    which ranks posts exactly like the decayed score but never goes stale, so
+    a stored score only has to change when the post's engagement does.
+    """
+    decay = math.log(2) / TRENDING_HALF_LIFE_HOURS
+    engagement = (
+        1
+        + LIKE_WEIGHT * Post.likes_count
+        + COMMENT_WEIGHT * Post.comments_count
+        + VIEW_WEIGHT * Post.views_count
+    )
+    created_at_hours = func.extract("epoch", Post.created_at) / 3600
+    return func.ln(engagement) + decay * created_at_hours
+
+
+async def refresh_trending(session, post_ids=None):
+    """Rescores ``post_ids``, or every post in the window when it is None.
+
+    Only the full refresh drops posts that aged out of the window; touched
+    posts that were deactivated are dropped either way.
+    """
+    cutoff = func.now() - timedelta(hours=TRENDING_WINDOW_HOURS)
+
+    scores = select(Post.id, trending_score(), func.now()).where(
+        Post.is_active, Post.created_at >= cutoff
+    )
+    if post_ids is not None:
+        scores = scores.where(Post.id.in_(sorted(post_ids)))
+    stmt = insert(PostTrending).from_select(["post_id", "score", "updated_at"], scores)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[PostTrending.post_id],
+        set_={"score": stmt.excluded.score, "updated_at": stmt.excluded.updated_at},
+        # Posts whose engagement has not moved keep their row untouched.
+        where=PostTrending.score.is_distinct_from(stmt.excluded.score),
+    )
+    await session.execute(stmt)
+
+    stmt = delete(PostTrending).where(
+        PostTrending.post_id == Post.id,
+        or_(Post.is_active.is_(False), Post.created_at < cutoff),
+    )
+    if post_ids is not None:
+        stmt = stmt.where(PostTrending.post_id.in_(sorted(post_ids)))
+    await session.execute(stmt)
+    await session.commit()
+
+
+class TrendingRefresher:
+    """Rescores the posts touched in this process every ``interval`` seconds,
+    and every post in the window at startup and every ``full_interval``
+    seconds, which also catches changes made elsewhere.
+    """
+
+    def __init__(
+        self,
+        interval: float = TRENDING_REFRESH_INTERVAL,
+        full_interval: float = TRENDING_FULL_REFRESH_INTERVAL,
+        session_factory=AsyncSessionLocal,
+    ):
+        self.interval = interval
+        self.full_interval = full_interval
+        self.session_factory = session_factory
+        self._task = None
+
+    async def refresh(self, full: bool = False):
+        post_ids = None
+        if not full:
+            if not touched_posts:
+                return
+            post_ids = set(touched_posts)
+            touched_posts.clear()
+
+        try:
+            async with self.session_factory() as session:
+                await refresh_trending(session, post_ids)
+        except Exception:
+            logger.exception("Failed to refresh trending posts")
+            if post_ids:
+                touched_posts.update(post_ids)
+
+    async def _run(self):
+        next_full = time.monotonic()
+        while True:
+            full = time.monotonic() >= next_full
+            if full:
+                next_full += self.full_interval
+            await self.refresh(full)
+            await asyncio.sleep(self.interval)
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+
+trending_refresher = TrendingRefresher()
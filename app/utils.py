@@ -1,2 +1,132 @@
+import base64
+import hashlib
+import json
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+import orjson
+from fastapi import Response
+from sqlalchemy import func, select
+
+
 def generate_slug(title):
     return title.lower().replace(" ", "-")
+
+
+def encode_cursor(value: datetime | int, id: int, *keys) -> str:
+    """``keys`` bind the cursor to the ordering it was made for, e.g. the
+    sort column and direction.
+    """
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([value, id, *keys]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str, *keys) -> tuple[datetime | int, int]:
+    """Decode a cursor made by ``encode_cursor`` with the same ``keys``."""
+    try:
+        value, id, *rest = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if rest != list(keys):
+            raise ValueError(rest)
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        elif not isinstance(value, int):
+            raise TypeError(value)
+        return value, int(id)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+
+async def fuzzy_lookup(session, model, column, value: str, fuzzy: bool = True):
+    stmt = select(model).where(column == value)
+    res = await session.execute(stmt)
+    obj = res.scalars().first()
+
+    if obj is None and fuzzy:
+        obj = await similar_lookup(session, model, column, value)
+
+    return obj
+
+
+async def similar_lookup(session, model, column, value: str):
+    """The row whose ``column`` is closest to ``value`` by trigram similarity."""
+    stmt = (
+        select(model)
+        .where(column.op("%>")(value))
+        .order_by(func.word_similarity(value, column).desc())
+        .limit(1)
+    )
+    res = await session.execute(stmt)
+    return res.scalars().first()
+
+
+def make_etag(*parts) -> str:
+    digest = hashlib.md5("|".join(map(str, parts)).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def validator_headers(etag: str, last_modified: datetime | None) -> dict:
+    headers = {"ETag": etag}
+    if last_modified:
+        headers["Last-Modified"] = format_datetime(
+            last_modified.astimezone(timezone.utc), usegmt=True
+        )
+    return headers
+
+
+def is_not_modified(request, etag: str, last_modified: datetime | None) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        return last_modified.replace(microsecond=0) <= since
+
+    return False
+
+
+def response_columns(model, schema) -> list:
+    return [getattr(model, name) for name in schema.model_fields]
+
+
+def parse_fields(fields: str | None, allowed) -> list[str] | None:
+    if fields is None:
+        return None
+
+    names = list(dict.fromkeys(name.strip() for name in fields.split(",")))
+    names = [name for name in names if name]
+    if not names:
+        raise ValueError("No fields requested")
+
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+    return names
+
+
+def encode_row(row):
+    return row._asdict()
+
+
+def dump_json(content) -> bytes:
+    # UTC as "Z", the way Pydantic writes it on the validated path.
+    return orjson.dumps(content, default=encode_row, option=orjson.OPT_UTC_Z)
+
+
+def json_response(content, headers: dict | None = None) -> Response:
+    """Serialize plain rows and dicts with orjson, skipping response_model
+    validation, for list endpoints that opt into ``fast``.
+    """
+    return Response(dump_json(content), media_type="application/json", headers=headers)
@@ -0,0 +1,139 @@
+"""Helpers shared by the benchmarks: a throwaway schema in the database from
+``.env``, an app wired to it, and latency/throughput measurement.
+"""
+
+import asyncio
+import math
+import statistics
+import subprocess
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.database import ASYNC_DB_URL, Base, engine, get_async_db
+
+
+@contextmanager
+def throwaway_schema(schema: str):
+    """Creates every table in a fresh ``schema`` and drops it afterwards."""
+    with engine.connect() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {schema}"))
+        conn.execute(text(f"SET search_path TO {schema}, public"))
+        Base.metadata.create_all(conn, checkfirst=False)
+        conn.commit()
+
+    try:
+        yield
+    finally:
+        with engine.connect() as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+            conn.commit()
+
+
+@contextmanager
+def schema_connection(schema: str):
+    with engine.connect() as conn:
+        conn.execute(text(f"SET search_path TO {schema}, public"))
+        yield conn
+
+
+class BenchDatabase:
+    """An async engine whose connections resolve tables in ``schema``, with a
+    count of the statements run on it.
+    """
+
+    def __init__(self, schema: str):
+        self.engine = create_async_engine(
+            ASYNC_DB_URL,
+            connect_args={"server_settings": {"search_path": f"{schema},public"}},
+        )
+        self.session_factory = async_sessionmaker(
+            bind=self.engine, autoflush=False, expire_on_commit=False
+        )
+        self.queries = 0
+        event.listen(self.engine.sync_engine, "after_cursor_execute", self._count)
+
+    def _count(self, conn, cursor, statement, parameters, context, many):
+        self.queries += 1
+
+    def override(self, app):
+        async def get_bench_db():
+            async with self.session_factory() as session:
+                yield session
+
+        app.dependency_overrides[get_async_db] = get_bench_db
+
+    async def dispose(self):
+        await self.engine.dispose()
+
+
+def percentile(timings: list[float], p: float) -> float:
+    """Nearest-rank percentile of already sorted ``timings``."""
+    return timings[max(math.ceil(len(timings) * p / 100) - 1, 0)]
+
+
+def summarize(timings: list[float]) -> dict:
+    timings = sorted(timings)
+    return {
+        "p50_ms": round(percentile(timings, 50), 3),
+        "p95_ms": round(percentile(timings, 95), 3),
+        "p99_ms": round(percentile(timings, 99), 3),
+        "mean_ms": round(statistics.fmean(timings), 3),
+    }
+
+
+async def drive(client, make_request, requests: int, concurrency: int, warmup=5):
+    """Sends ``requests`` requests from ``concurrency`` clients at once.
+
+    ``make_request()`` returns ``(method, url, json_body)`` for each request.
+    """
+
+    async def send():
+        method, url, body = make_request()
+        started = time.perf_counter()
+        res = await client.request(method, url, json=body)
+        return (time.perf_counter() - started) * 1000, res.status_code
+
+    for _ in range(warmup):
+        await send()
+
+    timings = []
+    errors = 0
+
+    async def worker(count: int):
+        nonlocal errors
+        for _ in range(count):
+            elapsed, status = await send()
+            timings.append(elapsed)
+            errors += status >= 400
+
+    per_worker = requests // concurrency
+    wall, cpu = time.perf_counter(), time.process_time()
+    await asyncio.gather(*(worker(per_worker) for _ in range(concurrency)))
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+
+    done = per_worker * concurrency
+    return {
+        "requests": done,
+        "warmup": warmup,
+        "errors": errors,
+        "requests_per_sec": round(done / wall, 1),
+        "cpu_ms_per_request": round(cpu / done * 1000, 3),
+        **summarize(timings),
+    }
+
+
+def git_revision() -> str | None:
+    try:
+        res = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return res.stdout.strip()
@@ -0,0 +1,146 @@
+"""Compare the post feed query with the old post_tags join and the semi-join.
+
+Seeds a throwaway schema in the database configured in ``.env`` and prints a
+JSON report with rows scanned (from ``EXPLAIN ANALYZE``), rows returned and
+latency percentiles for each variant:
+
+    python -m benchmarks.feed_tag_filter --posts 10000 --tags-per-post 5
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert, select, text
+from sqlalchemy.dialects import postgresql
+
+from app.database import Base, engine
+from app.models import Category, Post, PostTag, Tag, User
+from app.routers.posts import build_feed_query
+
+
+def seed(conn, posts: int, tags: int, tags_per_post: int):
+    conn.execute(insert(User), [{"id": 1, "password_hash": "x"}])
+    conn.execute(insert(Category), [{"id": 1, "name": "bench", "slug": "bench"}])
+    conn.execute(
+        insert(Tag),
+        [{"id": i, "name": f"tag {i}", "slug": f"tag-{i}"} for i in range(1, tags + 1)],
+    )
+
+    now = datetime.now(timezone.utc)
+    conn.execute(
+        insert(Post),
+        [
+            {
+                "id": i,
+                "user_id": 1,
+                "category_id": 1,
+                "title": f"post {i}",
+                "slug": f"post-{i}",
+                "body": "lorem ipsum " * 50,
+                "is_active": True,
+                "created_at": now - timedelta(minutes=i),
+                "updated_at": now,
+            }
+            for i in range(1, posts + 1)
+        ],
+    )
+    conn.execute(
+        insert(PostTag),
+        [
+            {"post_id": i, "tag_id": tag_id}
+            for i in range(1, posts + 1)
+            for tag_id in random.sample(range(1, tags + 1), tags_per_post)
+        ],
+    )
+    conn.execute(text("ANALYZE"))
+
+
+def join_query(tag_id: int | None, limit: int):
+    # The feed query as it was before the semi-join rework.
+    stmt = (
+        select(Post)
+        .join(PostTag, Post.id == PostTag.post_id)
+        .join(Tag, PostTag.tag_id == Tag.id)
+        .where(Post.is_active)
+    )
+    if tag_id:
+        stmt = stmt.where(Tag.id == tag_id)
+
+    return stmt.order_by(Post.created_at.desc(), Post.id.desc()).limit(limit + 1)
+
+
+def semi_join_query(tag_id: int | None, limit: int):
+    return build_feed_query(True, None, tag_id, None, limit)
+
+
+def rows_scanned(plan: dict) -> int:
+    total = 0
+    if "Scan" in plan["Node Type"]:
+        rows = plan["Actual Rows"] + plan.get("Rows Removed by Filter", 0)
+        total += rows * plan["Actual Loops"]
+    for child in plan.get("Plans", []):
+        total += rows_scanned(child)
+    return total
+
+
+def measure(conn, stmt, runs: int):
+    sql = stmt.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    explain = conn.execute(text(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}")).scalar()
+    plan = explain[0]["Plan"]
+
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        rows = conn.execute(stmt).all()
+        timings.append((time.perf_counter() - started) * 1000)
+
+    timings.sort()
+    return {
+        "rows_scanned": rows_scanned(plan),
+        "rows_returned": len(rows),
+        "p50_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(timings[int(len(timings) * 0.95) - 1], 3),
+        "mean_ms": round(statistics.fmean(timings), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--posts", type=int, default=10_000)
+    parser.add_argument("--tags", type=int, default=50)
+    parser.add_argument("--tags-per-post", type=int, default=5)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--schema", default="bench_feed")
+    args = parser.parse_args()
+
+    report = {"params": vars(args), "results": {}}
+    with engine.connect() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {args.schema} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {args.schema}"))
+        conn.execute(text(f"SET search_path TO {args.schema}, public"))
+        Base.metadata.create_all(conn, checkfirst=False)
+        seed(conn, args.posts, args.tags, args.tags_per_post)
+
+        try:
+            for scenario, tag_id in (("no_tag_filter", None), ("tag_filter", 1)):
+                report["results"][scenario] = {
+                    "join": measure(conn, join_query(tag_id, args.limit), args.runs),
+                    "semi_join": measure(
+                        conn, semi_join_query(tag_id, args.limit), args.runs
+                    ),
+                }
+        finally:
+            conn.rollback()
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
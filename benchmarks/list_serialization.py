@@ -0,0 +1,157 @@
+"""Compare the validated and the fast (orjson) paths of the list endpoints.
+
+Seeds a throwaway schema in the database configured in ``.env`` with
+``size`` users and ``size`` posts for each size, drives ``GET /users/list/``
+and ``GET /posts/`` in process with ``fast=false`` and ``fast=true``, and
+prints requests/sec and CPU time per request as JSON:
+
+    python -m benchmarks.list_serialization --sizes 100 1000 --requests 200
+
+The user list returns every row in one response. The post feed caps ``limit``
+at 100, so for larger sizes each request is one 100-row page and the requests
+cycle through every page of the feed; the figures are then per page. The
+post response cache is bypassed so every request serializes its page.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+import httpx
+from sqlalchemy import delete, insert
+
+from app.cache import posts_cache
+from app.main import app
+from app.models import Post, User
+from benchmarks.common import (
+    BenchDatabase,
+    drive,
+    schema_connection,
+    throwaway_schema,
+)
+
+POST_PAGE_SIZE = 100
+
+
+def seed(conn, count: int):
+    now = datetime.now(timezone.utc)
+
+    conn.execute(delete(Post))
+    conn.execute(delete(User))
+    conn.execute(
+        insert(User),
+        [
+            {
+                "id": i,
+                "email": f"user{i}@example.com",
+                "password_hash": "x" * 60,
+                "first_name": f"First {i}",
+                "last_name": f"Last {i}",
+                "bio": "lorem ipsum " * 10,
+            }
+            for i in range(1, count + 1)
+        ],
+    )
+    conn.execute(
+        insert(Post),
+        [
+            {
+                "id": i,
+                "user_id": i,
+                "title": f"Post {i}",
+                "slug": f"post-{i}",
+                "body": "lorem ipsum " * 100,
+                "created_at": now - timedelta(minutes=i),
+                "updated_at": now,
+            }
+            for i in range(1, count + 1)
+        ],
+    )
+    conn.commit()
+
+
+@contextmanager
+def uncached(cache):
+    """Loads every response, so the benchmark measures serialization rather
+    than cache hits.
+    """
+
+    async def get_or_load(name, params, loader):
+        return await loader()
+
+    cache.get_or_load = get_or_load
+    try:
+        yield
+    finally:
+        del cache.get_or_load
+
+
+async def post_page_urls(client, size: int, fast: bool) -> list[str]:
+    limit = min(size, POST_PAGE_SIZE)
+    urls = []
+    cursor = None
+    while len(urls) * limit < size:
+        params = {"limit": limit, "fast": fast}
+        if cursor:
+            params["cursor"] = cursor
+        urls.append(str(httpx.URL("/posts/", params=params)))
+
+        res = await client.get(urls[-1])
+        cursor = res.json()["next_cursor"]
+        if cursor is None:
+            break
+
+    return urls
+
+
+async def run(args):
+    db = BenchDatabase(args.schema)
+    db.override(app)
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+        for size in args.sizes:
+            with schema_connection(args.schema) as conn:
+                seed(conn, size)
+
+            scenarios = {
+                "users_validated": ["/users/list/"],
+                "users_fast": ["/users/list/?fast=true"],
+                "posts_validated": await post_page_urls(c, size, fast=False),
+                "posts_fast": await post_page_urls(c, size, fast=True),
+            }
+            results[size] = {}
+            for name, urls in scenarios.items():
+                next_url = itertools.cycle(urls).__next__
+                results[size][name] = await drive(
+                    c,
+                    lambda: ("GET", next_url(), None),
+                    args.requests,
+                    args.concurrency,
+                )
+
+    app.dependency_overrides.clear()
+    await db.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--schema", default="bench_lists")
+    args = parser.parse_args()
+
+    with throwaway_schema(args.schema), uncached(posts_cache):
+        results = asyncio.run(run(args))
+
+    print(json.dumps({"params": vars(args), "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""Load-test the key read and write endpoints against seeded data.
+
+Seeds a throwaway schema in the database configured in ``.env`` with users,
+categories, tags, posts, comments, devices and likes, then drives each
+scenario in process with concurrent clients. Prints JSON with throughput,
+p50/p95/p99 latency and DB queries per request for every scenario, tagged
+with the git revision so runs can be compared across commits:
+
+    python -m benchmarks.load --posts 10000 --concurrency 16 --output before.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+from datetime import datetime, timedelta, timezone
+
+import httpx
+from sqlalchemy import insert, text, update
+
+from app.counters import counters
+from app.main import app
+from app.models import Category, Comment, Device, Like, Post, PostTag, Tag, User
+from app.trending import refresh_trending
+from benchmarks.common import (
+    BenchDatabase,
+    drive,
+    git_revision,
+    schema_connection,
+    throwaway_schema,
+)
+
+WORDS = ["lorem", "ipsum", "dolor", "sit", "amet", "sport", "iqtisod", "dunyo"]
+CHUNK_SIZE = 5000
+
+
+def insert_chunked(conn, model, rows):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= CHUNK_SIZE:
+            conn.execute(insert(model), batch)
+            batch = []
+    if batch:
+        conn.execute(insert(model), batch)
+
+
+def seed(conn, args, rng: random.Random):
+    now = datetime.now(timezone.utc)
+
+    insert_chunked(
+        conn,
+        User,
+        (
+            {
+                "id": i,
+                "email": f"user{i}@example.com",
+                "password_hash": "x" * 60,
+                "first_name": f"First{i}",
+                "last_name": f"Last{i}",
+            }
+            for i in range(1, args.users + 1)
+        ),
+    )
+    insert_chunked(
+        conn,
+        Category,
+        (
+            {"id": i, "name": f"Category {i}", "slug": f"category-{i}"}
+            for i in range(1, args.categories + 1)
+        ),
+    )
+    insert_chunked(
+        conn,
+        Tag,
+        (
+            {"id": i, "name": f"Tag {i}", "slug": f"tag-{i}"}
+            for i in range(1, args.tags + 1)
+        ),
+    )
+    insert_chunked(
+        conn,
+        Post,
+        (
+            {
+                "id": i,
+                "user_id": rng.randint(1, args.users),
+                "category_id": rng.randint(1, args.categories),
+                "title": " ".join(rng.choices(WORDS, k=6)),
+                "slug": f"post-{i}",
+                "body": " ".join(rng.choices(WORDS, k=args.body_words)),
+                "mins_read": rng.randint(1, 15),
+                "is_active": rng.random() > 0.05,
+                "created_at": now - timedelta(minutes=i * 7),
+                "updated_at": now,
+            }
+            for i in range(1, args.posts + 1)
+        ),
+    )
+    insert_chunked(
+        conn,
+        PostTag,
+        (
+            {"post_id": i, "tag_id": tag_id}
+            for i in range(1, args.posts + 1)
+            for tag_id in rng.sample(range(1, args.tags + 1), args.tags_per_post)
+        ),
+    )
+    insert_chunked(
+        conn,
+        Comment,
+        (
+            {
+                "post_id": i,
+                "user_id": rng.randint(1, args.users),
+                "text": " ".join(rng.choices(WORDS, k=20)),
+                "created_at": now - timedelta(minutes=i * 7 - j),
+            }
+            for i in range(1, args.posts + 1)
+            for j in range(rng.randint(0, args.comments_per_post * 2))
+        ),
+    )
+    insert_chunked(
+        conn,
+        Device,
+        (
+            {"id": i, "user_agent": "bench", "last_active": now}
+            for i in range(1, args.devices + 1)
+        ),
+    )
+    insert_chunked(
+        conn,
+        Like,
+        (
+            {"device_id": device_id, "post_id": i}
+            for i in range(1, args.posts + 1)
+            for device_id in rng.sample(
+                range(1, args.devices + 1),
+                min(rng.randint(0, args.likes_per_post * 2), args.devices),
+            )
+        ),
+    )
+
+    # Counters as the app would have maintained them.
+    conn.execute(
+        update(Post).values(
+            likes_count=text("(SELECT count(*) FROM likes WHERE post_id = post.id)"),
+            comments_count=text(
+                "(SELECT count(*) FROM comments WHERE post_id = post.id)"
+            ),
+            views_count=text("(random() * 10000)::bigint"),
+        )
+    )
+    conn.execute(
+        update(User).values(
+            posts_count=text("(SELECT count(*) FROM post WHERE user_id = users.id)")
+        )
+    )
+    conn.execute(
+        update(Category).values(
+            posts_count=text(
+                "(SELECT count(*) FROM post WHERE category_id = categories.id)"
+            )
+        )
+    )
+    conn.execute(
+        update(Tag).values(
+            posts_count=text("(SELECT count(*) FROM post_tags WHERE tag_id = tags.id)")
+        )
+    )
+    conn.commit()
+    conn.execute(text("ANALYZE"))
+
+
+def build_scenarios(args, rng: random.Random):
+    def post_id():
+        return rng.randint(1, args.posts)
+
+    return {
+        "feed": lambda: ("GET", "/posts/?limit=20", None),
+        "feed_by_category": lambda: (
+            "GET",
+            f"/posts/?category_id={rng.randint(1, args.categories)}",
+            None,
+        ),
+        "feed_by_tag": lambda: (
+            "GET",
+            f"/posts/?tag_id={rng.randint(1, args.tags)}",
+            None,
+        ),
+        "feed_summary": lambda: ("GET", "/posts/summary/?limit=20", None),
+        "feed_expanded": lambda: ("GET", "/posts/expanded/?limit=20", None),
+        "search": lambda: ("GET", f"/posts/search/?q={rng.choice(WORDS)}", None),
+        "trending": lambda: ("GET", "/posts/trending/", None),
+        "comments": lambda: ("GET", f"/comments/post/{post_id()}/", None),
+        "categories": lambda: ("GET", "/categories/list/", None),
+        "tags": lambda: ("GET", "/tag/list/", None),
+        "user": lambda: ("GET", f"/users/First{rng.randint(1, args.users)}/", None),
+        "like": lambda: (
+            "POST",
+            "/likes/",
+            {"device_id": rng.randint(1, args.devices), "post_id": post_id()},
+        ),
+    }
+
+
+async def run(args, rng: random.Random):
+    db = BenchDatabase(args.schema)
+    db.override(app)
+    # Buffered counter writes must land in the bench schema too.
+    for counter in counters:
+        counter.session_factory = db.session_factory
+
+    async with db.session_factory() as session:
+        await refresh_trending(session)
+
+    scenarios = build_scenarios(args, rng)
+    selected = args.scenarios or list(scenarios)
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+        for name in selected:
+            queries = db.queries
+            result = await drive(c, scenarios[name], args.requests, args.concurrency)
+            sent = result["requests"] + result["warmup"]
+            result["queries_per_request"] = round((db.queries - queries) / sent, 2)
+            results[name] = result
+
+    for counter in counters:
+        await counter.flush()
+
+    app.dependency_overrides.clear()
+    await db.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--categories", type=int, default=10)
+    parser.add_argument("--tags", type=int, default=100)
+    parser.add_argument("--posts", type=int, default=10_000)
+    parser.add_argument("--tags-per-post", type=int, default=3)
+    parser.add_argument("--comments-per-post", type=int, default=5)
+    parser.add_argument("--devices", type=int, default=5000)
+    parser.add_argument("--likes-per-post", type=int, default=10)
+    parser.add_argument("--body-words", type=int, default=400)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--scenarios", nargs="+")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--schema", default="bench_load")
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    unknown = set(args.scenarios or ()) - set(build_scenarios(args, rng))
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    with throwaway_schema(args.schema):
+        with schema_connection(args.schema) as conn:
+            seed(conn, args, rng)
+        results = asyncio.run(run(args, rng))
+
+    report = {"revision": git_revision(), "params": vars(args), "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Runs the app against an in-memory SQLite database.
+
+Postgres-only column types are compiled to their SQLite equivalents and
+generated columns are dropped, which is enough for endpoints that don't rely
+on full-text search.
+"""
+
+import asyncio
+import os
+
+os.environ.setdefault("DB_HOST", "localhost")
+os.environ.setdefault("DB_PORT", "5432")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import BigInteger, event
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.ext.compiler import compiles
+
+from app.database import Base, get_async_db
+from app.main import app
+
+
+@compiles(TSVECTOR, "sqlite")
+def compile_tsvector(type_, compiler, **kw):
+    return "TEXT"
+
+
+@compiles(BigInteger, "sqlite")
+def compile_big_integer(type_, compiler, **kw):
+    # SQLite only autoincrements INTEGER PRIMARY KEY columns.
+    return "INTEGER"
+
+
+for table in Base.metadata.tables.values():
+    for column in table.c:
+        if column.computed is not None:
+            column.computed = None
+            column.server_default = None
+
+
+class QueryCounter:
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine.sync_engine, "after_cursor_execute", self._count)
+
+    def _count(self, conn, cursor, statement, parameters, context, many):
+        self.count += 1
+
+
+@pytest.fixture
+def engine():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+
+    async def create_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    asyncio.run(create_tables())
+    yield engine
+    asyncio.run(engine.dispose())
+
+
+@pytest.fixture
+def session_factory(engine):
+    return async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+
+@pytest.fixture
+def client(session_factory):
+    async def get_test_db():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_async_db] = get_test_db
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def queries(engine):
+    return QueryCounter(engine)
@@ -0,0 +1,95 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import insert, select
+
+from app.models import Comment, Post, User
+
+
+@pytest.fixture(autouse=True)
+def seed(session_factory):
+    async def insert_rows():
+        async with session_factory() as session:
+            await session.execute(insert(User).values(id=1, password_hash="x"))
+            await session.execute(
+                insert(Post),
+                [
+                    {
+                        "id": i,
+                        "user_id": 1,
+                        "title": f"Post {i}",
+                        "slug": f"post-{i}",
+                        "body": "lorem",
+                    }
+                    for i in (1, 2)
+                ],
+            )
+            await session.commit()
+
+    asyncio.run(insert_rows())
+
+
+def comments_count(session_factory, post_id: int) -> int:
+    async def run():
+        async with session_factory() as session:
+            stmt = select(Post.comments_count).where(Post.id == post_id)
+            return await session.scalar(stmt)
+
+    return asyncio.run(run())
+
+
+def test_comments_count_follows_creates_and_deletes(client, session_factory):
+    ids = []
+    for text in ("first", "second"):
+        res = client.post(
+            "/comments/create/", json={"user_id": 1, "post_id": 1, "text": text}
+        )
+        assert res.status_code == 200
+        ids.append(res.json()["id"])
+
+    assert comments_count(session_factory, 1) == 2
+
+    assert client.delete(f"/comments/{ids[0]}/").status_code == 200
+    assert client.delete(f"/comments/{ids[0]}/").status_code == 404
+
+    assert comments_count(session_factory, 1) == 1
+    assert comments_count(session_factory, 2) == 0
+
+
+def test_cursor_continues_after_the_last_comment(client, session_factory):
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    # Comments 2 and 3 share a timestamp, so the page boundary falls on the id.
+    created = [now, now + timedelta(seconds=1), now + timedelta(seconds=1)]
+    created += [now + timedelta(seconds=i) for i in (2, 3)]
+
+    async def insert_comments():
+        async with session_factory() as session:
+            await session.execute(
+                insert(Comment),
+                [
+                    {
+                        "id": i,
+                        "post_id": 1,
+                        "user_id": 1,
+                        "text": f"comment {i}",
+                        "created_at": created_at,
+                        "updated_at": created_at,
+                    }
+                    for i, created_at in enumerate(created, start=1)
+                ],
+            )
+            await session.commit()
+
+    asyncio.run(insert_comments())
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2} | ({"cursor": cursor} if cursor else {})
+        page = client.get("/comments/post/1/", params=params).json()
+        seen.append([comment["id"] for comment in page["items"]])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == [[1, 2], [3, 4], [5]]
@@ -0,0 +1,46 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app.utils import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trips_its_sort():
+    created_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    assert decode_cursor(encode_cursor(created_at, 7)) == (created_at, 7)
+    cursor = encode_cursor(12, 7, "likes_count", True)
+    assert decode_cursor(cursor, "likes_count", True) == (12, 7)
+
+
+@pytest.mark.parametrize(
+    "cursor, keys",
+    [
+        (encode_cursor(12, 7, "likes_count", True), ("views_count", True)),
+        (encode_cursor(12, 7, "likes_count", True), ("likes_count", False)),
+        (encode_cursor(12, 7, "likes_count", True), ()),
+        (encode_cursor(12, 7), ("likes_count", True)),
+        ("not a cursor", ()),
+    ],
+)
+def test_cursor_for_another_ordering_is_rejected(cursor, keys):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, *keys)
+
+
+def test_comments_reject_a_count_cursor(client):
+    res = client.get("/comments/post/1/", params={"cursor": encode_cursor(12, 7)})
+
+    assert res.status_code == 400
+
+
+@pytest.mark.parametrize("descending, status", [(True, 200), (False, 400)])
+def test_feed_rejects_a_cursor_from_the_other_direction(client, descending, status):
+    params = {
+        "sort": "likes_count",
+        "descending": descending,
+        "cursor": encode_cursor(12, 7, "likes_count", True),
+    }
+    res = client.get("/posts/filter/", params=params)
+
+    assert res.status_code == status
@@ -0,0 +1,90 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import insert
+
+from app.models import Category, Media, Post, PostMedia, PostTag, Tag, User
+
+POSTS = 30
+
+
+@pytest.fixture(autouse=True)
+def seed(session_factory):
+    now = datetime.now(timezone.utc)
+
+    async def insert_rows():
+        async with session_factory() as session:
+            await session.execute(
+                insert(User),
+                [
+                    {"id": i, "password_hash": "x", "first_name": f"User {i}"}
+                    for i in range(1, 4)
+                ],
+            )
+            await session.execute(
+                insert(Category),
+                [
+                    {"id": i, "name": f"Category {i}", "slug": f"category-{i}"}
+                    for i in range(1, 4)
+                ],
+            )
+            await session.execute(
+                insert(Tag),
+                [
+                    {"id": i, "name": f"Tag {i}", "slug": f"tag-{i}"}
+                    for i in range(1, 6)
+                ],
+            )
+            await session.execute(
+                insert(Media),
+                [
+                    {"id": i, "url": f"https://cdn.example.com/{i}.jpg"}
+                    for i in range(1, 6)
+                ],
+            )
+            await session.execute(
+                insert(Post),
+                [
+                    {
+                        "id": i,
+                        "user_id": i % 3 + 1,
+                        "category_id": i % 3 + 1,
+                        "title": f"Post {i}",
+                        "slug": f"post-{i}",
+                        "body": "lorem ipsum",
+                        "is_active": True,
+                        "created_at": now - timedelta(minutes=i),
+                        "updated_at": now,
+                    }
+                    for i in range(1, POSTS + 1)
+                ],
+            )
+            await session.execute(
+                insert(PostTag),
+                [
+                    {"post_id": i, "tag_id": tag_id}
+                    for i in range(1, POSTS + 1)
+                    for tag_id in (i % 5 + 1, (i + 1) % 5 + 1)
+                ],
+            )
+            await session.execute(
+                insert(PostMedia),
+                [{"post_id": i, "media_id": i % 5 + 1} for i in range(1, POSTS + 1)],
+            )
+            await session.commit()
+
+    asyncio.run(insert_rows())
+
+
+@pytest.mark.parametrize("limit", [5, 25])
+def test_expanded_feed_query_count_is_constant(client, queries, limit):
+    res = client.get("/posts/expanded/", params={"limit": limit})
+
+    assert res.status_code == 200
+    page = res.json()
+    assert len(page["items"]) == limit
+    assert all(post["tags"] and post["media"] for post in page["items"])
+    # The page with its user and category, then one query each for the tags
+    # and the media of every post on it.
+    assert queries.count == 3
@@ -0,0 +1,75 @@
+import asyncio
+from collections import Counter
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import insert, select, update
+
+from app.counters import like_counter, reconcile_likes_count
+from app.models import Device, Like, Post, User
+
+
+@pytest.fixture(autouse=True)
+def seed(session_factory, monkeypatch):
+    # Deltas stay buffered: the batched UPDATE ... FROM VALUES is Postgres only.
+    monkeypatch.setattr(like_counter, "_pending", Counter())
+    monkeypatch.setattr(like_counter, "_events", 0)
+    now = datetime.now(timezone.utc)
+
+    async def insert_rows():
+        async with session_factory() as session:
+            await session.execute(insert(User).values(id=1, password_hash="x"))
+            await session.execute(
+                insert(Post).values(
+                    id=1, user_id=1, title="Post", slug="post", body="lorem"
+                )
+            )
+            await session.execute(
+                insert(Device),
+                [{"id": i, "user_agent": "test", "last_active": now} for i in (1, 2)],
+            )
+            await session.commit()
+
+    asyncio.run(insert_rows())
+
+
+def test_repeated_like_counts_once(client):
+    for _ in range(2):
+        res = client.post("/likes/", json={"device_id": 1, "post_id": 1})
+        assert res.status_code == 200
+        assert res.json()["liked"] is True
+
+    client.post("/likes/", json={"device_id": 2, "post_id": 1})
+
+    assert like_counter._pending == {1: 2}
+
+
+def test_unlike_without_a_like_does_not_decrement(client):
+    client.post("/likes/", json={"device_id": 1, "post_id": 1})
+
+    for _ in range(2):
+        res = client.delete("/likes/", params={"device_id": 1, "post_id": 1})
+        assert res.status_code == 200
+        assert res.json()["liked"] is False
+
+    client.delete("/likes/", params={"device_id": 2, "post_id": 1})
+
+    assert like_counter._pending == {1: 0}
+    assert like_counter._events == 2
+
+
+def test_reconcile_recounts_drifted_likes(session_factory):
+    async def run():
+        async with session_factory() as session:
+            await session.execute(
+                insert(Like), [{"device_id": i, "post_id": 1} for i in (1, 2)]
+            )
+            await session.execute(update(Post).values(likes_count=7))
+            await session.commit()
+
+            fixed = await reconcile_likes_count(session)
+            again = await reconcile_likes_count(session)
+            likes = await session.scalar(select(Post.likes_count))
+            return fixed, again, likes
+
+    assert asyncio.run(run()) == (1, 0, 2)
@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+from sqlalchemy import insert, select, update
+
+from app.models import Category, Post, User
+from app.post_counts import reconcile_post_counts
+from app.routers import posts
+
+
+@pytest.fixture(autouse=True)
+def seed(session_factory, monkeypatch):
+    # The batched UPDATE ... FROM VALUES is Postgres only; apply the same
+    # deltas row by row.
+    async def apply_posts_count(session, model, deltas):
+        for id, n in deltas.items():
+            stmt = (
+                update(model)
+                .where(model.id == id)
+                .values(posts_count=model.posts_count + n)
+            )
+            await session.execute(stmt)
+
+    monkeypatch.setattr(posts, "apply_posts_count", apply_posts_count)
+
+    async def insert_rows():
+        async with session_factory() as session:
+            await session.execute(insert(User).values(id=1, password_hash="x"))
+            await session.execute(
+                insert(Category),
+                [
+                    {"id": 1, "name": "Sport", "slug": "sport", "posts_count": 1},
+                    {"id": 2, "name": "Dunyo", "slug": "dunyo", "posts_count": 0},
+                ],
+            )
+            await session.execute(
+                insert(Post).values(
+                    id=1,
+                    user_id=1,
+                    category_id=1,
+                    title="Post",
+                    slug="post",
+                    body="lorem",
+                )
+            )
+            await session.commit()
+
+    asyncio.run(insert_rows())
+
+
+def category_counts(session_factory) -> dict:
+    async def run():
+        async with session_factory() as session:
+            res = await session.execute(select(Category.id, Category.posts_count))
+            return dict(res.all())
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("method", ["put", "patch"])
+def test_category_change_moves_posts_count(client, session_factory, method):
+    res = client.request(method, "/posts/1/", json={"category_id": 2})
+    assert res.status_code == 200
+    assert category_counts(session_factory) == {1: 0, 2: 1}
+
+    # Setting the same category again changes nothing.
+    client.request(method, "/posts/1/", json={"category_id": 2})
+    assert category_counts(session_factory) == {1: 0, 2: 1}
+
+
+@pytest.mark.parametrize("method", ["put", "patch"])
+def test_unknown_category_is_rejected(client, session_factory, method):
+    res = client.request(method, "/posts/1/", json={"category_id": 99})
+
+    assert res.status_code == 404
+    assert category_counts(session_factory) == {1: 1, 2: 0}
+
+
+def test_reconcile_fixes_drifted_posts_count(session_factory):
+    async def run():
+        async with session_factory() as session:
+            await session.execute(update(Category).values(posts_count=5))
+            await session.commit()
+            await reconcile_post_counts(session)
+
+    asyncio.run(run())
+    assert category_counts(session_factory) == {1: 1, 2: 0}
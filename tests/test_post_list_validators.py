@@ -0,0 +1,81 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import insert, update
+
+from app.cache import posts_cache
+from app.models import Post, User
+
+
+@pytest.fixture(autouse=True)
+def seed(session_factory):
+    asyncio.run(posts_cache.invalidate())
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    async def insert_rows():
+        async with session_factory() as session:
+            await session.execute(insert(User).values(id=1, password_hash="x"))
+            await session.execute(
+                insert(Post),
+                [
+                    {
+                        "id": i,
+                        "user_id": 1,
+                        "title": f"Post {i}",
+                        "slug": f"post-{i}",
+                        "body": "lorem",
+                        "is_active": True,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                    for i in (1, 2)
+                ],
+            )
+            await session.commit()
+
+    asyncio.run(insert_rows())
+
+
+def flush_likes(session_factory, post_id: int, likes: int):
+    # What CounterBuffer.flush writes: the counter, with updated_at kept.
+    async def run():
+        async with session_factory() as session:
+            stmt = (
+                update(Post)
+                .where(Post.id == post_id)
+                .values(likes_count=likes, updated_at=Post.updated_at)
+            )
+            await session.execute(stmt)
+            await session.commit()
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("fast", [False, True])
+def test_counter_fields_revalidate_after_a_flush(client, session_factory, fast):
+    params = {"fields": "id,likes_count", "fast": fast}
+    res = client.get("/posts/", params=params)
+    etag = res.headers["etag"]
+    assert "last-modified" not in res.headers
+    assert {post["likes_count"] for post in res.json()["items"]} == {0}
+
+    flush_likes(session_factory, 1, 3)
+
+    res = client.get("/posts/", params=params, headers={"If-None-Match": etag})
+    assert res.status_code == 200
+    assert res.headers["etag"] != etag
+    likes = {post["id"]: post["likes_count"] for post in res.json()["items"]}
+    assert likes == {1: 3, 2: 0}
+
+
+def test_other_fields_still_answer_304(client, session_factory):
+    res = client.get("/posts/", params={"fields": "id,title"})
+    etag = res.headers["etag"]
+
+    flush_likes(session_factory, 1, 3)
+
+    res = client.get(
+        "/posts/", params={"fields": "id,title"}, headers={"If-None-Match": etag}
+    )
+    assert res.status_code == 304
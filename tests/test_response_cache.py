@@ -0,0 +1,122 @@
+import asyncio
+import time
+
+import pytest
+from fakeredis import FakeAsyncRedis
+
+from app.cache import MemoryBackend, RedisBackend, ResponseCache
+
+
+@pytest.fixture(params=["memory", "redis"])
+def backend(request):
+    if request.param == "redis":
+        return RedisBackend(FakeAsyncRedis())
+    return MemoryBackend()
+
+
+def test_values_round_trip(backend):
+    cache = ResponseCache("posts", backend)
+    page = {"items": [{"id": 1, "title": "Salom"}], "next_cursor": None}
+
+    async def load():
+        return page
+
+    async def run():
+        await cache.get_or_load("list", {"limit": 20}, load)
+        return await cache.get_or_load("list", {"limit": 20}, load)
+
+    assert asyncio.run(run()) == page
+    assert cache.hits == 1
+
+
+def test_invalidate_drops_cached_values(backend):
+    cache = ResponseCache("posts", backend)
+    loads = 0
+
+    async def load():
+        nonlocal loads
+        loads += 1
+        return {"id": 1}
+
+    async def run():
+        await cache.get_or_load("detail", {"slug": "a"}, load)
+        await cache.invalidate()
+        await cache.get_or_load("detail", {"slug": "a"}, load)
+
+    asyncio.run(run())
+    assert loads == 2
+
+
+def test_waiter_takes_over_when_the_load_fails(backend):
+    # Two workers sharing one backend.
+    first = ResponseCache("posts", backend, lock_timeout=5.0)
+    second = ResponseCache("posts", backend, lock_timeout=5.0)
+
+    async def failing_load():
+        await asyncio.sleep(0.1)
+        raise RuntimeError("database is down")
+
+    async def load():
+        return {"id": 1}
+
+    async def run():
+        failed, loaded = await asyncio.gather(
+            first.get_or_load("detail", {"slug": "a"}, failing_load),
+            second.get_or_load("detail", {"slug": "a"}, load),
+            return_exceptions=True,
+        )
+        return failed, loaded
+
+    started = time.monotonic()
+    failed, loaded = asyncio.run(run())
+
+    assert isinstance(failed, RuntimeError)
+    assert loaded == {"id": 1}
+    assert time.monotonic() - started < 1
+
+
+def test_waiter_gets_the_value_loaded_by_another_worker(backend):
+    first = ResponseCache("posts", backend)
+    second = ResponseCache("posts", backend)
+    loads = 0
+
+    async def load():
+        nonlocal loads
+        loads += 1
+        await asyncio.sleep(0.1)
+        return {"id": 1}
+
+    async def run():
+        return await asyncio.gather(
+            first.get_or_load("detail", {"slug": "a"}, load),
+            second.get_or_load("detail", {"slug": "a"}, load),
+        )
+
+    assert asyncio.run(run()) == [{"id": 1}, {"id": 1}]
+    assert loads == 1
+
+
+def test_not_found_results_are_cached(backend):
+    first = ResponseCache("posts", backend)
+    second = ResponseCache("posts", backend)
+    loads = 0
+
+    async def load():
+        nonlocal loads
+        loads += 1
+        await asyncio.sleep(0.1)
+
+    async def run():
+        # The second worker waits on the first's lock and reads its marker.
+        concurrent = await asyncio.gather(
+            first.get_or_load("detail", {"slug": "missing"}, load),
+            second.get_or_load("detail", {"slug": "missing"}, load),
+        )
+        again = await first.get_or_load("detail", {"slug": "missing"}, load)
+        return concurrent, again
+
+    started = time.monotonic()
+    assert asyncio.run(run()) == ([None, None], None)
+    assert loads == 1
+    assert first.hits == 1
+    assert time.monotonic() - started < 1
@@ -0,0 +1,29 @@
+import asyncio
+
+from sqlalchemy import select
+
+from app.counters import SearchTermCounter
+from app.models import UserSearch
+from app.routers.posts import search_terms
+
+
+def test_search_terms_leave_out_websearch_syntax():
+    assert search_terms('"Foo bar" -baz or Qux, quux') == {"foo", "bar", "qux", "quux"}
+
+
+def test_search_terms_are_counted_in_one_flush(session_factory):
+    counter = SearchTermCounter(session_factory=session_factory)
+
+    async def run():
+        for q in ("foo bar", "foo", "bar baz"):
+            for term in search_terms(q):
+                counter.record(term)
+        await counter.flush()
+        counter.record("foo")
+        await counter.flush()
+
+        async with session_factory() as session:
+            res = await session.execute(select(UserSearch.term, UserSearch.count))
+            return dict(res.all())
+
+    assert asyncio.run(run()) == {"foo": 3, "bar": 2, "baz": 1}
@@ -0,0 +1,53 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app import trending
+from app.trending import TrendingRefresher, touch_trending, touched_posts
+
+
+@asynccontextmanager
+async def no_session():
+    yield None
+
+
+@pytest.fixture
+def refreshed(monkeypatch):
+    calls = []
+
+    async def refresh_trending(session, post_ids=None):
+        calls.append(post_ids)
+
+    monkeypatch.setattr(trending, "refresh_trending", refresh_trending)
+    touched_posts.clear()
+    yield calls
+    touched_posts.clear()
+
+
+def test_refresh_rescores_only_touched_posts(refreshed):
+    refresher = TrendingRefresher(session_factory=no_session)
+
+    touch_trending([3, 1])
+    touch_trending([3])
+    asyncio.run(refresher.refresh())
+    asyncio.run(refresher.refresh())
+    asyncio.run(refresher.refresh(full=True))
+
+    # Nothing touched on the second run, so it skips the database.
+    assert refreshed == [{1, 3}, None]
+    assert not touched_posts
+
+
+def test_failed_refresh_keeps_posts_queued(monkeypatch):
+    async def refresh_trending(session, post_ids=None):
+        raise RuntimeError("database is down")
+
+    monkeypatch.setattr(trending, "refresh_trending", refresh_trending)
+    touched_posts.clear()
+    touch_trending([5])
+
+    asyncio.run(TrendingRefresher(session_factory=no_session).refresh())
+
+    assert touched_posts == {5}
+    touched_posts.clear()